@@ -1,21 +1,33 @@
 # VisaTier 5.0 - Enhanced Immigration ROI Calculator
 # Advanced AI-powered business migration intelligence with personalized insights
 
+import argparse
 import math
+import copy
+import os
+import pickle
+import threading
+import time
+import multiprocessing
+import concurrent.futures
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
-import gradio as gr
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import json
 from datetime import datetime, timedelta
 import hashlib
+import base64
 import secrets
-from typing import Dict, List, Tuple, Optional
+import subprocess
+import sys
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple, Optional
 import asyncio
-from dataclasses import dataclass, field
-import random
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+
+if TYPE_CHECKING:
+    # Plotly is imported by the chart methods on first use
+    import plotly.graph_objects as go
 
 # =========================
 # ENHANCED STYLING SYSTEM
@@ -211,6 +223,7 @@ PREMIUM_CSS = """
 .kpi-card.success .kpi-value { color: var(--success); }
 .kpi-card.warning .kpi-value { color: var(--warning); }
 .kpi-card.error .kpi-value { color: var(--error); }
+.kpi-card.pending .kpi-value { color: var(--text-muted); }
 /* AI Insight Cards */
 .ai-insights-grid {
     display: grid;
@@ -386,20 +399,28 @@ PREMIUM_CSS = """
 }
 """
 
-PREMIUM_THEME = gr.themes.Soft(
-    primary_hue="blue",
-    secondary_hue="slate",
-    neutral_hue="slate"
-).set(
-    body_background_fill="#f8fafc",
-    body_text_color="#1e293b",
-    button_primary_background_fill="#2563eb",
-    button_primary_background_fill_hover="#1d4ed8",
-    input_background_fill="#ffffff",
-    input_border_width="2px",
-    block_background_fill="#ffffff",
-    block_radius="12px"
-)
+@lru_cache(maxsize=1)
+def build_premium_theme():
+    """Gradio theme for the app.
+    Built on first use so that importing this module (e.g. in CLI runs or
+    process-pool workers) does not load Gradio.
+    """
+    import gradio as gr
+    
+    return gr.themes.Soft(
+        primary_hue="blue",
+        secondary_hue="slate",
+        neutral_hue="slate"
+    ).set(
+        body_background_fill="#f8fafc",
+        body_text_color="#1e293b",
+        button_primary_background_fill="#2563eb",
+        button_primary_background_fill_hover="#1d4ed8",
+        input_background_fill="#ffffff",
+        input_border_width="2px",
+        block_background_fill="#ffffff",
+        block_radius="12px"
+    )
 
 # =========================
 # ENHANCED DATA MODELS WITH AI
@@ -454,6 +475,8 @@ class CountryData:
         special_programs: Notable government or business programs.
         recent_changes: Recent regulatory or market changes summary.
         ai_sentiment: AI-derived market sentiment score.
+        driver_model: Monte Carlo driver distribution; ``None`` uses the
+            default ``DriverModel``.
     """
     
     name: str
@@ -474,6 +497,121 @@ class CountryData:
     special_programs: List[str]
     recent_changes: str
     ai_sentiment: float  # Market sentiment score
+    driver_model: Optional['DriverModel'] = None
+
+# Monte Carlo business drivers, in the order of DriverModel.correlation
+DRIVER_NAMES = ("revenue", "margin", "success", "cost_inflation")
+
+# Legacy draws: revenue = N(1, .18) + .3 * N(0, .2) and margin = N(1, .12) - .1 * revenue
+LEGACY_REVENUE_VOLATILITY = math.sqrt(0.18 ** 2 + (0.3 * 0.2) ** 2)
+LEGACY_MARGIN_VOLATILITY = math.sqrt(0.12 ** 2 + (0.1 * LEGACY_REVENUE_VOLATILITY) ** 2)
+LEGACY_REVENUE_MARGIN_CORRELATION = -0.1 * LEGACY_REVENUE_VOLATILITY / LEGACY_MARGIN_VOLATILITY
+
+# Loadings of revenue and margin on the legacy market shock .2 * N(0, 1)
+LEGACY_MARKET_LOADINGS = (
+    0.3 * 0.2 / LEGACY_REVENUE_VOLATILITY,
+    -0.1 * 0.3 * 0.2 / LEGACY_MARGIN_VOLATILITY,
+    0.0,
+    0.0
+)
+
+@dataclass(frozen=True)
+class DriverModel:
+    """Joint distribution of the Monte Carlo business drivers.
+    Revenue, margin and cost inflation multipliers are normal; the success
+    multiplier keeps its skewed Beta(8, 2) marginal through a Gaussian
+    copula. All four are correlated through ``correlation`` (ordered as
+    ``DRIVER_NAMES``) and sampled in one block with its cached Cholesky
+    factor. The defaults reproduce the previous hand-coded structure;
+    country risk only widens the volatilities when
+    ``risk_volatility_weight`` is set above zero.
+    Attributes:
+        revenue_mean: Mean revenue multiplier.
+        revenue_volatility: Standard deviation of the revenue multiplier.
+        margin_mean: Mean margin multiplier.
+        margin_volatility: Standard deviation of the margin multiplier.
+        success_scale: Factor applied to the Beta(8, 2) success draw.
+        cost_volatility: Standard deviation of living cost inflation around 1.
+        correlation: Driver correlation matrix as nested tuples.
+        risk_volatility_weight: How strongly country risk factors widen the
+            volatilities (economic risk for revenue and cost, regulatory
+            risk for margin); ``0`` keeps the legacy distribution.
+        market_loadings: Part of each driver's correlation explained by a
+            market factor common to every country, used when countries are
+            simulated jointly.
+    """
+    
+    revenue_mean: float = 1.0
+    revenue_volatility: float = LEGACY_REVENUE_VOLATILITY
+    margin_mean: float = 0.9
+    margin_volatility: float = LEGACY_MARGIN_VOLATILITY
+    success_scale: float = 1.2
+    cost_volatility: float = 0.15
+    correlation: Tuple[Tuple[float, ...], ...] = (
+        (1.0, LEGACY_REVENUE_MARGIN_CORRELATION, 0.0, 0.0),
+        (LEGACY_REVENUE_MARGIN_CORRELATION, 1.0, 0.0, 0.0),
+        (0.0, 0.0, 1.0, 0.0),
+        (0.0, 0.0, 0.0, 1.0)
+    )
+    risk_volatility_weight: float = 0.0
+    market_loadings: Tuple[float, ...] = LEGACY_MARKET_LOADINGS
+    
+    def for_risk(self, risk_factors: Dict[str, float]) -> 'DriverModel':
+        """Copy with volatilities widened by a country's risk factors"""
+        weight = self.risk_volatility_weight
+        economic = 1 + weight * risk_factors.get('economic', 0.0)
+        regulatory = 1 + weight * risk_factors.get('regulatory', 0.0)
+        return replace(
+            self,
+            revenue_volatility=self.revenue_volatility * economic,
+            margin_volatility=self.margin_volatility * regulatory,
+            cost_volatility=self.cost_volatility * economic,
+            risk_volatility_weight=0.0
+        )
+    
+    def sample(self, normals: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Driver multipliers from an (n x 4) block of independent standard normals.
+        Returns:
+            Revenue, margin, success and cost inflation multipliers.
+        """
+        correlated = normals @ driver_cholesky(self.correlation).T
+        return self._multipliers(correlated)
+    
+    def sample_with_market(self, market: np.ndarray, normals: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Driver multipliers sharing a common market factor.
+        The correlation is split into ``market_loadings`` on ``market`` plus
+        an idiosyncratic remainder, so each country keeps the same marginal
+        joint distribution as ``sample`` while countries co-move through
+        the shared factor.
+        Args:
+            market: Common standard normal market factor, one per iteration.
+            normals: (n x 4) block of independent standard normals for this country.
+        Returns:
+            Revenue, margin, success and cost inflation multipliers.
+        """
+        loadings = np.asarray(self.market_loadings, dtype=float)
+        residual = np.asarray(self.correlation, dtype=float) - np.outer(loadings, loadings)
+        factor = driver_cholesky(tuple(map(tuple, residual)))
+        correlated = np.multiply.outer(market, loadings) + normals @ factor.T
+        return self._multipliers(correlated)
+    
+    def _multipliers(self, correlated: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Map correlated standard normals onto the driver marginals"""
+        revenue = self.revenue_mean + self.revenue_volatility * correlated[:, 0]
+        margin = self.margin_mean + self.margin_volatility * correlated[:, 1]
+        success = inverse_beta_8_2_cdf(normal_cdf(correlated[:, 2])) * self.success_scale
+        cost_inflation = np.maximum(0.8, 1.0 + self.cost_volatility * correlated[:, 3])
+        return revenue, margin, success, cost_inflation
+
+@lru_cache(maxsize=64)
+def driver_cholesky(correlation: Tuple[Tuple[float, ...], ...]) -> np.ndarray:
+    """Lower Cholesky factor of a driver correlation matrix, cached per matrix"""
+    try:
+        factor = np.linalg.cholesky(np.asarray(correlation, dtype=float))
+    except np.linalg.LinAlgError:
+        raise ValueError("Driver correlation matrix must be positive definite")
+    factor.flags.writeable = False
+    return factor
 
 # Enhanced user profiles with detailed personas
 ENHANCED_PROFILES = {
@@ -705,6 +843,168 @@ ENHANCED_COUNTRIES = {
     )
 }
 
+# =========================
+# REPRODUCIBLE RANDOM STREAMS
+# =========================
+
+def make_rng(seed: Optional[int], *stream: str) -> np.random.Generator:
+    """Independent, reproducible random generator for one named stream.
+    The stream names (e.g. ``"monte_carlo"`` and a country name) are hashed
+    into the ``SeedSequence`` spawn key, so every country gets its own child
+    stream of ``seed`` whatever the run order or worker that draws from it.
+    Args:
+        seed: Root seed; ``None`` draws fresh OS entropy.
+        *stream: Names identifying the child stream.
+    Returns:
+        A ``numpy.random.Generator`` for that stream.
+    """
+    spawn_key = tuple(
+        int.from_bytes(hashlib.blake2b(str(name).encode(), digest_size=4).digest(), "little")
+        for name in stream
+    )
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=spawn_key))
+
+# =========================
+# VARIANCE-REDUCTION SAMPLING
+# =========================
+
+SAMPLING_STRATEGIES = ("pseudo", "antithetic", "lhs", "sobol")
+
+# Joe-Kuo (new-joe-kuo-6.21201) primitive polynomial degree, coefficients and
+# initial direction numbers for Sobol dimensions 2 onwards
+SOBOL_PARAMETERS = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+)
+SOBOL_BITS = 32
+SOBOL_MAX_DIMENSIONS = len(SOBOL_PARAMETERS) + 1
+
+@lru_cache(maxsize=16)
+def sobol_direction_numbers(dimensions: int) -> np.ndarray:
+    """Direction numbers for the first ``dimensions`` Sobol coordinates.
+    Args:
+        dimensions: Number of coordinates, at most ``SOBOL_MAX_DIMENSIONS``.
+    Returns:
+        A read-only ``(dimensions, SOBOL_BITS)`` array of ``uint64`` values.
+    """
+    if dimensions > SOBOL_MAX_DIMENSIONS:
+        raise ValueError(f"Sobol sampling supports up to {SOBOL_MAX_DIMENSIONS} dimensions")
+    
+    directions = np.zeros((dimensions, SOBOL_BITS), dtype=np.uint64)
+    # First coordinate is the van der Corput sequence
+    directions[0] = [1 << (SOBOL_BITS - 1 - bit) for bit in range(SOBOL_BITS)]
+    
+    for dim in range(1, dimensions):
+        degree, coefficients, initial = SOBOL_PARAMETERS[dim - 1]
+        v = [0] * SOBOL_BITS
+        for bit in range(SOBOL_BITS):
+            if bit < degree:
+                v[bit] = initial[bit] << (SOBOL_BITS - 1 - bit)
+            else:
+                v[bit] = v[bit - degree] ^ (v[bit - degree] >> degree)
+                for k in range(1, degree):
+                    if (coefficients >> (degree - 1 - k)) & 1:
+                        v[bit] ^= v[bit - k]
+        directions[dim] = v
+    
+    directions.flags.writeable = False
+    return directions
+
+def sobol_uniforms(n: int, dimensions: int, rng: np.random.Generator) -> np.ndarray:
+    """Randomized Sobol points in ``(0, 1)``.
+    Points are generated in Gray-code order and scrambled with a random
+    digital shift per coordinate, so they stay low-discrepancy while
+    averages over them are unbiased. Balance is best when ``n`` is a power
+    of two.
+    """
+    directions = sobol_direction_numbers(dimensions)
+    index = np.arange(n, dtype=np.uint64)
+    gray = index ^ (index >> np.uint64(1))
+    points = np.zeros((n, dimensions), dtype=np.uint64)
+    for bit in range(SOBOL_BITS):
+        mask = ((gray >> np.uint64(bit)) & np.uint64(1)).astype(bool)
+        points[mask] ^= directions[:, bit]
+    
+    shift = rng.integers(0, 1 << SOBOL_BITS, size=dimensions, dtype=np.uint64)
+    return ((points ^ shift).astype(float) + 0.5) / float(1 << SOBOL_BITS)
+
+def sample_uniforms(strategy: str, n: int, dimensions: int,
+                    rng: np.random.Generator) -> np.ndarray:
+    """An ``(n, dimensions)`` matrix of uniforms drawn with a variance-reduction strategy.
+    Args:
+        strategy: ``"antithetic"`` (mirrored pairs ``u`` and ``1 - u``),
+            ``"lhs"`` (Latin hypercube: one draw per equal-probability
+            stratum in every coordinate) or ``"sobol"`` (randomized
+            quasi-Monte Carlo).
+        n: Number of points.
+        dimensions: Number of coordinates.
+        rng: Source of randomness.
+    Returns:
+        Uniform samples strictly inside ``(0, 1)``.
+    """
+    if strategy == "antithetic":
+        half = rng.random(((n + 1) // 2, dimensions))
+        return np.concatenate([half, 1 - half])[:n]
+    if strategy == "lhs":
+        strata = np.argsort(rng.random((n, dimensions)), axis=0)
+        return (strata + rng.random((n, dimensions))) / n
+    if strategy == "sobol":
+        return sobol_uniforms(n, dimensions, rng)
+    raise ValueError(f"Unknown sampling strategy: {strategy}")
+
+def inverse_normal_cdf(u: np.ndarray) -> np.ndarray:
+    """Standard normal quantiles (Acklam's rational approximation, |rel. error| < 1.2e-9)"""
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+         3.754408661907416e+00)
+    p_low = 0.02425
+    
+    u = np.asarray(u, dtype=float)
+    z = np.empty_like(u)
+    
+    # Central region
+    central = (u > p_low) & (u < 1 - p_low)
+    q = u[central] - 0.5
+    r = q * q
+    z[central] = ((((((a[0]*r + a[1])*r + a[2])*r + a[3])*r + a[4])*r + a[5]) * q /
+                  (((((b[0]*r + b[1])*r + b[2])*r + b[3])*r + b[4])*r + 1))
+    
+    # Tails, mirrored for the upper one
+    tail = ~central
+    q = np.sqrt(-2 * np.log(np.minimum(u[tail], 1 - u[tail])))
+    tail_z = ((((((c[0]*q + c[1])*q + c[2])*q + c[3])*q + c[4])*q + c[5]) /
+              ((((d[0]*q + d[1])*q + d[2])*q + d[3])*q + 1))
+    z[tail] = np.where(u[tail] < 0.5, tail_z, -tail_z)
+    return z
+
+def normal_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF via the Abramowitz-Stegun 7.1.26 erf approximation (|error| < 1.5e-7)"""
+    x = np.asarray(x, dtype=float)
+    t = 1 / (1 + 0.3275911 * np.abs(x) / math.sqrt(2))
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    tail = 0.5 * poly * np.exp(-x * x / 2)
+    return np.where(x >= 0, 1 - tail, tail)
+
+def inverse_beta_8_2_cdf(u: np.ndarray, iterations: int = 40) -> np.ndarray:
+    """Quantiles of Beta(8, 2), whose CDF is ``9x^8 - 8x^9``, by bisection"""
+    u = np.asarray(u, dtype=float)
+    lower = np.zeros_like(u)
+    upper = np.ones_like(u)
+    for _ in range(iterations):
+        middle = (lower + upper) / 2
+        below = middle ** 8 * (9 - 8 * middle) < u
+        lower = np.where(below, middle, lower)
+        upper = np.where(below, upper, middle)
+    return (lower + upper) / 2
+
 # =========================
 # AI-POWERED INSIGHTS ENGINE
 # =========================
@@ -712,13 +1012,16 @@ ENHANCED_COUNTRIES = {
 class AIInsightEngine:
     """Engine that crafts personalized AI insights for ROI simulations.
     Attributes:
+        seed: Root seed for the per-country random streams (``None`` = unseeded).
         insight_templates: Persona-specific message templates keyed by persona id.
         risk_mitigation_strategies: Mapping of risk types to mitigation tactics.
         success_catalysts: Key success factors for each profile.
     """
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         """Initialize insight templates and supporting lookup tables.
+        Args:
+            seed: Root seed making generated insights reproducible.
         Returns:
             None
         Side Effects:
@@ -726,6 +1029,7 @@ class AIInsightEngine:
             insight generation.
         """
         
+        self.seed = seed
         self.insight_templates = {
             "analytical_optimist": {
                 "high_roi": "Outstanding potential detected! Your tech profile + {country} = perfect storm for growth. The {special_metric} factor could amplify returns by {multiplier}x.",
@@ -780,12 +1084,15 @@ class AIInsightEngine:
             "content_creator": ["Viral content", "Brand partnerships", "Platform diversification"]
         }
     
-    def generate_personalized_insight(self, profile: UserProfile, country: CountryData, result: Dict) -> Dict:
+    def generate_personalized_insight(self, profile: UserProfile, country: CountryData, result: Dict,
+                                      rng: Optional[np.random.Generator] = None) -> Dict:
         """Generate AI-powered insights for a given profile and country.
         Args:
             profile: The active user's profile information.
             country: Destination country data being evaluated.
             result: Output from the ROI calculator containing financial metrics.
+            rng: Random generator for the jitter; defaults to the
+                (seed, profile, country) child stream.
         Returns:
             A dictionary containing the generated insight text, confidence
             score, tier, key factors and action items.
@@ -793,6 +1100,7 @@ class AIInsightEngine:
             Logs an error message to stdout if insight generation fails.
         """
         try:
+            rng = rng if rng is not None else make_rng(self.seed, "insight", profile.id, country.name)
             roi = result.get('roi', 0)
             risk_score = result.get('risk_score', 50)
             confidence = result.get('monte_carlo', {}).get('probability_positive_roi', 0.5)
@@ -810,7 +1118,7 @@ class AIInsightEngine:
             template = self.insight_templates.get(persona, self.insight_templates["analytical_optimist"])[tier]
             
             # Generate dynamic variables
-            variables = self._generate_insight_variables(profile, country, result, tier)
+            variables = self._generate_insight_variables(profile, country, result, tier, rng)
             
             # Format the insight
             insight_text = template.format(**variables)
@@ -818,12 +1126,12 @@ class AIInsightEngine:
             # Add risk warning if needed
             if risk_score > 70:
                 risk_template = self.insight_templates[persona]["risk_warning"]
-                risk_variables = self._generate_risk_variables(country, risk_score)
+                risk_variables = self._generate_risk_variables(country, risk_score, rng)
                 risk_text = risk_template.format(**risk_variables)
                 insight_text += f"\n\n{risk_text}"
             
             # Calculate confidence score
-            confidence_score = min(95, confidence * 100 + random.uniform(-5, 5))
+            confidence_score = min(95, confidence * 100 + rng.uniform(-5, 5))
             
             return {
                 "text": insight_text,
@@ -847,7 +1155,8 @@ class AIInsightEngine:
                 "success_probability": 70
             }
     
-    def _generate_insight_variables(self, profile: UserProfile, country: CountryData, result: Dict, tier: str) -> Dict:
+    def _generate_insight_variables(self, profile: UserProfile, country: CountryData, result: Dict, tier: str,
+                                    rng: np.random.Generator) -> Dict:
         """Generate dynamic variables for insight templates"""
         variables = {
             "country": country.name,
@@ -893,11 +1202,11 @@ class AIInsightEngine:
         
         # ROI-specific variables
         if tier == "high_roi":
-            variables["percentage"] = str(random.randint(15, 25))
+            variables["percentage"] = str(rng.integers(15, 26))
         elif tier == "medium_roi":
-            variables["percentage"] = str(random.randint(8, 15))
+            variables["percentage"] = str(rng.integers(8, 16))
         else:
-            variables["percentage"] = str(random.randint(3, 8))
+            variables["percentage"] = str(rng.integers(3, 9))
         
         # Risk-specific variables
         top_risk = max(country.risk_factors.items(), key=lambda x: x[1])
@@ -905,7 +1214,8 @@ class AIInsightEngine:
         
         return variables
     
-    def _generate_risk_variables(self, country: CountryData, risk_score: float) -> Dict:
+    def _generate_risk_variables(self, country: CountryData, risk_score: float,
+                                 rng: np.random.Generator) -> Dict:
         """Generate risk-specific variables"""
         top_risk = max(country.risk_factors.items(), key=lambda x: x[1])
         risk_type = top_risk[0]
@@ -915,7 +1225,7 @@ class AIInsightEngine:
             "regulation_risk": f"{country.name}'s evolving regulatory landscape",
             "mitigation": ", ".join(self.risk_mitigation_strategies.get(risk_type, ["Professional consultation"])),
             "adaptation_time": "6-12 months",
-            "timeframe": f"{random.randint(18, 36)} months",
+            "timeframe": f"{rng.integers(18, 37)} months",
             "risk_area": risk_type,
             "alternatives": "Portugal, Ireland" if country.name != "Portugal" else "Malta, Cyprus",
             "inflation_factor": f"{country.living_cost/1000:.1f}x cost increase"
@@ -979,21 +1289,400 @@ class AIInsightEngine:
 # ENHANCED CALCULATION ENGINE
 # =========================
 
+@dataclass(frozen=True, eq=False)
+class CashFlowKernel:
+    """Precomputed monthly vectors for one cash flow projection shape.
+    Monthly cash flows are always ``monthly_delta * weights``, so once these
+    vectors exist every base metric is a dot product or a lookup rather
+    than a per-month Python loop. All methods accept a scalar delta or an
+    array of deltas.
+    Attributes:
+        weights: Seasonality x compounded growth factor for each month.
+        cumulative_weights: Running sum of ``weights`` used for payback lookups.
+        discount_factors: Monthly discount factor applied to each month.
+        npv_weight: Discounted sum of ``weights``.
+        total_weight: Undiscounted sum of ``weights``.
+    """
+    
+    weights: np.ndarray
+    cumulative_weights: np.ndarray
+    discount_factors: np.ndarray
+    npv_weight: float
+    total_weight: float
+    
+    def flows(self, monthly_delta):
+        """Monthly cash flows; a (n,) delta array yields an (n, months) matrix"""
+        return np.multiply.outer(monthly_delta, self.weights)
+    
+    def total_return(self, monthly_delta):
+        """Undiscounted sum of monthly cash flows"""
+        return monthly_delta * self.total_weight
+    
+    def npv(self, monthly_delta, setup_cost):
+        """Net present value including the upfront setup cost"""
+        return -setup_cost + monthly_delta * self.npv_weight
+    
+    def payback_months(self, monthly_delta, setup_cost):
+        """First month whose cumulative flow covers the setup cost, else inf"""
+        monthly_delta = np.asarray(monthly_delta, dtype=float)
+        with np.errstate(divide='ignore'):
+            breakeven = np.where(monthly_delta > 0, setup_cost / monthly_delta, np.inf)
+        index = np.searchsorted(self.cumulative_weights, breakeven, side='left')
+        return np.where(index < len(self.weights), index + 1.0, np.inf)
+
+@lru_cache(maxsize=512)
+def build_cash_flow_kernel(seasonality: Tuple[float, ...], time_horizon: int,
+                           discount_rate: float, growth_rate: float) -> CashFlowKernel:
+    """Build (and cache) the cash flow vectors for a country shape and horizon.
+    Args:
+        seasonality: Twelve monthly seasonality factors of the country.
+        time_horizon: Projection length in months.
+        discount_rate: Annual discount rate percentage.
+        growth_rate: Compounded monthly growth rate.
+    Returns:
+        A ``CashFlowKernel`` whose arrays are read-only, since instances are
+        shared between every caller hitting the cache.
+    """
+    months = np.arange(int(time_horizon))
+    weights = np.asarray(seasonality, dtype=float)[months % 12] * (1 + growth_rate) ** months
+    discount_monthly = (1 + discount_rate/100) ** (1/12) - 1
+    discount_factors = (1 + discount_monthly) ** -(months + 1.0)
+    cumulative_weights = np.cumsum(weights)
+    
+    for vector in (weights, cumulative_weights, discount_factors):
+        vector.flags.writeable = False
+    
+    return CashFlowKernel(
+        weights=weights,
+        cumulative_weights=cumulative_weights,
+        discount_factors=discount_factors,
+        npv_weight=float(weights @ discount_factors),
+        total_weight=float(cumulative_weights[-1]) if len(weights) else 0.0
+    )
+
+def static_risk_score(political, economic, regulatory, sentiment, risk_tolerance):
+    """Risk points that depend only on country and profile data.
+    Works element-wise, so the same weights score a single country or a
+    whole column of the ``CountryTable`` at once.
+    """
+    # Base country risks
+    political_risk = political * 25
+    economic_risk = economic * 35
+    regulatory_risk = regulatory * 25
+    
+    # Market sentiment risk
+    sentiment_risk = (1 - sentiment) * 15
+    
+    # Profile risk adjustment
+    risk_tolerance_adjustment = (100 - risk_tolerance) / 100 * 20
+    
+    return political_risk + economic_risk + regulatory_risk + sentiment_risk + risk_tolerance_adjustment
+
+class ResultCache:
+    """Thread-safe LRU cache with optional expiry for calculator results.
+    Values are deep-copied on the way in and out so callers can freely
+    mutate what they receive.
+    Attributes:
+        maxsize: Maximum number of entries kept; ``0`` disables caching.
+        ttl: Seconds an entry stays valid, or ``None`` for no expiry.
+        hits: Number of lookups served from the cache.
+        misses: Number of lookups that found no valid entry.
+    """
+    
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = 900.0):
+        """Create an empty cache.
+        Args:
+            maxsize: Maximum number of entries kept before LRU eviction.
+            ttl: Entry lifetime in seconds; ``None`` keeps entries until evicted.
+        Returns:
+            None
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __getstate__(self) -> Dict:
+        """Pickle configuration only, so calculators can ship to worker processes"""
+        return {"maxsize": self.maxsize, "ttl": self.ttl}
+    
+    def __setstate__(self, state: Dict) -> None:
+        """Restore an empty cache with the pickled configuration"""
+        self.__init__(**state)
+    
+    def get(self, key) -> Optional[Dict]:
+        """Return a copy of the cached value for ``key`` or ``None``"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = entry[1]
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+        return copy.deepcopy(value)
+    
+    def put(self, key, value: Dict) -> None:
+        """Store a copy of ``value`` under ``key``, evicting the oldest entries"""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self) -> None:
+        """Drop every cached entry; hit/miss counters are kept"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict:
+        """Current size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+# Shared by every calculator instance unless one is given its own cache
+ROI_RESULT_CACHE = ResultCache(maxsize=256, ttl=900.0)
+
+# Positional layout of the calculator inputs
+ROI_INPUT_NAMES = (
+    "current_revenue", "current_margin", "current_corp_tax", "current_pers_tax",
+    "current_living", "current_business", "revenue_multiplier", "margin_improvement",
+    "success_probability", "time_horizon", "discount_rate"
+)
+
+# Keys of the base metrics result, in their historical order
+BASE_METRICS = (
+    "npv", "roi", "irr_annual", "mirr_annual", "payback_months", "payback_years",
+    "monthly_delta", "total_return", "monthly_flows", "setup_cost",
+    "profitability_index", "current_net_income", "projected_net_income"
+)
+
+# Base metrics that depend on the discount rate
+DISCOUNTED_METRICS = ("npv", "mirr_annual", "profitability_index")
+
+# Tail ROI percentiles whose standard errors drive adaptive Monte Carlo
+MONTE_CARLO_TAIL_PERCENTILES = (0.05, 0.95)
+
+# Metrics kept for each what-if scenario
+SCENARIO_METRICS = ("roi", "npv", "payback_years", "profitability_index")
+
+# One-at-a-time sensitivity variables: (name, input index, test values, relative).
+# Relative values scale the base input; the others replace it outright.
+SENSITIVITY_VARIABLES = (
+    ('revenue', 0, (0.8, 0.9, 1.1, 1.2, 1.3), True),
+    ('margin', 1, (-5, -2, 2, 5, 8), False),
+    ('revenue_multiplier', 6, (0.8, 1.0, 1.5, 2.0, 2.5), True),
+    ('margin_improvement', 7, (-5, 0, 5, 10, 15), False),
+    ('success_probability', 8, (50, 65, 80, 90, 95), False)
+)
+
+def country_fingerprint(country: CountryData) -> Tuple:
+    """Hashable snapshot of the country fields that feed the calculations"""
+    return (
+        country.name, country.corp_tax, country.pers_tax, country.living_cost,
+        country.business_cost, country.setup_cost, country.market_growth,
+        country.ease_score, country.banking_score, country.ai_sentiment,
+        tuple(country.seasonality), tuple(sorted(country.risk_factors.items())),
+        country.driver_model
+    )
+
+def refresh_country_data() -> None:
+    """Invalidate every cache derived from ``ENHANCED_COUNTRIES``.
+    Call after editing country data in place. Cached ROI results are also
+    keyed on ``country_fingerprint``, so stale entries are never served,
+    but they would otherwise linger until evicted.
+    Returns:
+        None
+    """
+    ROI_RESULT_CACHE.invalidate()
+    build_cash_flow_kernel.cache_clear()
+    get_country_table.cache_clear()
+    get_country_score_index.cache_clear()
+    dashboard_risk_return_trace.cache_clear()
+
+# Sentinel for "no cached value"
+_MISSING = object()
+
+class CalculationGraph:
+    """Dependency-tracked cache of named calculation nodes.
+    Inputs are plain values; every node is a function of its declared
+    dependencies (inputs or other nodes) whose result is kept until one of
+    those dependencies changes. ``set_inputs`` only invalidates the nodes
+    downstream of inputs whose value actually changed, so nudging a single
+    slider recomputes just the part of the calculation that depends on it.
+    Attributes:
+        evaluations: Number of times each node has been computed.
+        lock: Re-entrant lock callers hold while updating and reading a graph.
+    """
+    
+    def __init__(self):
+        """Create an empty graph.
+        Returns:
+            None
+        """
+        self._inputs = {}
+        self._nodes = {}
+        self._dependents = {}
+        self._values = {}
+        self.evaluations = {}
+        self.lock = threading.RLock()
+    
+    def add_input(self, name: str) -> None:
+        """Declare an input; it must be set before dependent nodes are read"""
+        self._dependents.setdefault(name, set())
+        self._inputs.setdefault(name, None)
+    
+    def add_node(self, name: str, dependencies: Tuple[str, ...], compute) -> None:
+        """Declare a node computed as ``compute(*dependency_values)``"""
+        for dependency in dependencies:
+            if dependency not in self._dependents:
+                raise ValueError(f"Node {name!r} depends on undeclared {dependency!r}")
+            self._dependents[dependency].add(name)
+        self._dependents.setdefault(name, set())
+        self._nodes[name] = (tuple(dependencies), compute)
+    
+    def set_inputs(self, **values) -> List[str]:
+        """Update inputs and invalidate everything downstream of changed ones.
+        Inputs are compared with ``==``, so they should be scalars.
+        Returns:
+            Names of the inputs whose value changed.
+        """
+        changed = []
+        for name, value in values.items():
+            if name not in self._inputs:
+                raise KeyError(f"Unknown graph input: {name!r}")
+            if name in self._values and self._values[name] == value:
+                continue
+            self._inputs[name] = value
+            self._values[name] = value
+            changed.append(name)
+            self._invalidate(name)
+        return changed
+    
+    def _invalidate(self, name: str) -> None:
+        """Drop cached values of every node that depends on ``name``"""
+        pending = list(self._dependents[name])
+        seen = set()
+        while pending:
+            node = pending.pop()
+            if node not in seen:
+                seen.add(node)
+                self._values.pop(node, None)
+                pending.extend(self._dependents[node])
+    
+    def get(self, name: str):
+        """Value of an input or node, computing stale nodes on demand"""
+        value = self._values.get(name, _MISSING)
+        if value is not _MISSING:
+            return value
+        if name in self._inputs:
+            raise KeyError(f"Graph input {name!r} has not been set")
+        
+        dependencies, compute = self._nodes[name]
+        value = compute(*(self.get(dependency) for dependency in dependencies))
+        self._values[name] = value
+        self.evaluations[name] = self.evaluations.get(name, 0) + 1
+        return value
+    
+    def is_cached(self, name: str) -> bool:
+        """Whether ``name`` currently holds a valid value"""
+        return name in self._values
+
+# Calculation graphs of every calculator unpickled in this process, such as
+# the per-job copies a process-pool worker receives. Graph keys include the
+# calculator settings, so these calculators can share one store and each
+# job reuses the nodes of earlier jobs that ran in the same worker.
+_PROCESS_GRAPHS: "OrderedDict[Tuple, CalculationGraph]" = OrderedDict()
+_PROCESS_GRAPHS_LOCK = threading.Lock()
+
+
 class AdvancedROICalculator:
     """Performs ROI calculations with advanced analytics and simulations.
     Attributes:
         monte_carlo_iterations: Number of simulations for Monte Carlo analysis.
+        adaptive_monte_carlo: Simulate in batches until the confidence
+            intervals meet the tolerances instead of a fixed iteration count.
+            Applies to comprehensive results and Monte Carlo sweeps; the
+            joint portfolio simulation always draws ``monte_carlo_iterations``.
+        monte_carlo_batch_size: Draws per batch in adaptive mode.
+        monte_carlo_max_iterations: Hard cap on adaptive draws.
+        mean_roi_tolerance: Target 95% confidence half-width of mean ROI as
+            a fraction of ``|mean ROI|``.
+        quantile_tolerance: Target 95% confidence half-width of the tail ROI
+            percentiles as a fraction of the ROI standard deviation; tails
+            are never accepted before ``monte_carlo_iterations`` draws.
+        absolute_roi_tolerance: Half-width of mean ROI in percentage points
+            that is always precise enough, so results with mean ROI near
+            zero still converge.
         confidence_intervals: Confidence interval levels used in reporting.
+        histogram_bins: Number of bins in the shipped Monte Carlo ROI histogram.
+        sampling: Monte Carlo sampling strategy, one of ``SAMPLING_STRATEGIES``.
+        monthly_growth_rate: Compounded monthly growth applied to cash flows.
+        result_cache: Memo of comprehensive results keyed on normalized inputs.
+        seed: Default root seed for the per-country Monte Carlo streams.
+        max_graphs: Number of per-(profile, country) calculation graphs kept
+            for incremental what-if updates.
     """
     
-    def __init__(self):
+    def __init__(self, result_cache: Optional[ResultCache] = None, seed: Optional[int] = None):
         """Initialize calculator defaults for Monte Carlo and confidence levels.
+        Args:
+            result_cache: Cache for comprehensive results; defaults to the
+                module-wide ``ROI_RESULT_CACHE`` shared by all calculators.
+            seed: Default root seed; ``None`` keeps simulations unseeded.
         Returns:
             None
         """
         
         self.monte_carlo_iterations = 2000  # Increased for better accuracy
+        self.adaptive_monte_carlo = False
+        self.monte_carlo_batch_size = 500
+        self.monte_carlo_max_iterations = 20000
+        # Typical inputs converge within 2000-3500 draws
+        self.mean_roi_tolerance = 0.03
+        self.quantile_tolerance = 0.1
+        self.absolute_roi_tolerance = 75.0
         self.confidence_intervals = [0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95]
+        self.histogram_bins = 30
+        self.sampling = "pseudo"
+        self.monthly_growth_rate = 0.02  # 2% monthly growth assumption
+        self.result_cache = result_cache if result_cache is not None else ROI_RESULT_CACHE
+        self.seed = seed
+        self.max_graphs = 32
+        self._graphs = OrderedDict()
+        self._graphs_lock = threading.Lock()
+    
+    def __getstate__(self) -> Dict:
+        """Pickle without calculation graphs, which are local to this process"""
+        state = self.__dict__.copy()
+        del state['_graphs'], state['_graphs_lock']
+        return state
+    
+    def __setstate__(self, state: Dict) -> None:
+        """Restore a calculator that shares this process's calculation graphs.
+        Every executor job pickles the calculator again; attaching the copy
+        to ``_PROCESS_GRAPHS`` keeps graphs alive from one job to the next
+        instead of starting each worker job from an empty graph.
+        """
+        self.__dict__.update(state)
+        self._graphs = _PROCESS_GRAPHS
+        self._graphs_lock = _PROCESS_GRAPHS_LOCK
     
     def calculate_comprehensive_roi(
         self,
@@ -1009,7 +1698,8 @@ class AdvancedROICalculator:
         margin_improvement: float,
         success_probability: float,
         time_horizon: int,
-        discount_rate: float
+        discount_rate: float,
+        seed: Optional[int] = None
     ) -> Dict:
         """Calculate ROI metrics with Monte Carlo, sensitivity, and scenarios.
         Args:
@@ -1026,192 +1716,573 @@ class AdvancedROICalculator:
             success_probability: Probability of achieving projected results (0-100).
             time_horizon: Time horizon in months for the projection.
             discount_rate: Annual discount rate percentage for NPV calculations.
+            seed: Root seed for the Monte Carlo draws; defaults to the
+                calculator's ``seed``. Each country draws from its own
+                child stream, so results do not depend on run order.
         Returns:
             A dictionary containing base metrics, Monte Carlo results,
             sensitivity analyses, scenario comparisons, and risk/opportunity
             scores.
         Side Effects:
-            Logs an error to stdout and returns fallback metrics on failure.
+            Stores successful results in ``result_cache``. Logs an error to
+            stdout and returns fallback metrics on failure.
         """
         
         try:
-            # Input validation and normalization
-            current_revenue = max(1000, float(current_revenue or 45000))
-            current_margin = max(1, min(95, float(current_margin or 25)))
-            
-            # Base calculation
-            base_result = self._calculate_base_metrics(
-                profile, country, current_revenue, current_margin,
-                current_corp_tax, current_pers_tax, current_living, current_business,
-                revenue_multiplier, margin_improvement, success_probability,
-                time_horizon, discount_rate
+            inputs = self._normalize_inputs(
+                current_revenue, current_margin, current_corp_tax, current_pers_tax,
+                current_living, current_business, revenue_multiplier, margin_improvement,
+                success_probability, time_horizon, discount_rate
             )
             
-            # Advanced analytics
-            monte_carlo_result = self._advanced_monte_carlo(
-                profile, country, current_revenue, current_margin,
-                revenue_multiplier, margin_improvement, success_probability,
-                time_horizon, discount_rate
-            )
+            # Repeat requests with the same inputs are a dictionary lookup
+            seed = self.seed if seed is None else seed
+            cache_key = self._result_cache_key(profile, country, seed, *inputs)
+            cached_result = self.result_cache.get(cache_key)
+            if cached_result is not None:
+                return cached_result
             
-            sensitivity_result = self._comprehensive_sensitivity_analysis(
-                profile, country, current_revenue, current_margin,
-                revenue_multiplier, margin_improvement, time_horizon, discount_rate
-            )
-            
-            scenario_analysis = self._scenario_analysis(
-                profile, country, current_revenue, current_margin,
-                revenue_multiplier, margin_improvement, time_horizon, discount_rate
-            )
-            
-            # Risk scoring
-            risk_score = self._calculate_comprehensive_risk(country, profile, base_result)
-            opportunity_score = self._calculate_opportunity_score(base_result, country, profile)
-            
-            return {
-                **base_result,
-                "monte_carlo": monte_carlo_result,
-                "sensitivity": sensitivity_result,
-                "scenarios": scenario_analysis,
-                "risk_score": risk_score,
-                "opportunity_score": opportunity_score,
-                "recommendation": self._generate_recommendation(base_result, risk_score, opportunity_score)
-            }
+            result = self._compute_comprehensive_roi(profile, country, *inputs, seed=seed)
+            self.result_cache.put(cache_key, result)
+            return result
             
         except Exception as e:
             print(f"ROI Calculation Error: {e}")
             return self._get_fallback_result(country, time_horizon)
     
-    def _calculate_base_metrics(self, profile, country, *args) -> Dict:
-        """Enhanced base metrics calculation"""
+    def calculate_quick_metrics(self, profile: UserProfile, country: CountryData, *args,
+                                seed: Optional[int] = None) -> Dict:
+        """Base metrics plus risk and opportunity scores, without the analytics.
+        Reads only the cheap nodes of the (profile, country) calculation
+        graph, so live what-if updates skip Monte Carlo, sensitivity and
+        scenarios. A later ``calculate_comprehensive_roi`` on this same
+        calculator instance reuses what was computed; runs in other
+        processes (e.g. the app's process-pool workers) have their own
+        graphs and do not.
+        Args:
+            profile: Active user profile used for multipliers.
+            country: Destination country configuration.
+            *args: The eleven calculator inputs in ``ROI_INPUT_NAMES`` order.
+            seed: Root seed; defaults to the calculator's ``seed``.
+        Returns:
+            The base metrics dictionary with ``risk_score`` and
+            ``opportunity_score`` added.
+        Side Effects:
+            Logs an error to stdout and returns fallback metrics on failure.
+        """
+        try:
+            inputs = self._normalize_inputs(*args)
+            seed = self.seed if seed is None else seed
+            graph = self._calculation_graph(profile, country)
+            with graph.lock:
+                graph.set_inputs(seed=seed, **dict(zip(ROI_INPUT_NAMES, inputs)))
+                return copy.deepcopy({
+                    **graph.get("base"),
+                    "risk_score": graph.get("risk_score"),
+                    "opportunity_score": graph.get("opportunity_score")
+                })
+            
+        except Exception as e:
+            print(f"Quick metrics error: {e}")
+            return self._get_fallback_result(country, int(args[9]) if len(args) > 9 else 60)
+    
+    def calculate_many(self, profile: UserProfile, countries: Dict[str, CountryData],
+                       *args, executor: Optional['AnalysisExecutor'] = None,
+                       seed: Optional[int] = None) -> Dict[str, Dict]:
+        """Run ``calculate_comprehensive_roi`` for several countries at once.
+        Args:
+            profile: Active user profile used for multipliers.
+            countries: Destination countries keyed by country identifier.
+            *args: The eleven numeric inputs of ``calculate_comprehensive_roi``.
+            executor: Worker pool for the uncached countries; runs serially
+                in this process when omitted.
+            seed: Root seed for the Monte Carlo draws; defaults to ``self.seed``.
+        Returns:
+            Comprehensive results keyed by country identifier, in the order
+            of ``countries``.
+        Side Effects:
+            Same as ``iter_many``.
+        """
+        results = dict(self.iter_many(profile, countries, *args, executor=executor, seed=seed))
+        return {country_key: results[country_key] for country_key in countries}
+    
+    def iter_many(self, profile: UserProfile, countries: Dict[str, CountryData],
+                  *args, executor: Optional['AnalysisExecutor'] = None,
+                  seed: Optional[int] = None) -> Iterator[Tuple[str, Dict]]:
+        """Yield ``(country_key, result)`` pairs as each country's analysis lands.
+        Cached results are yielded first; the remaining countries are
+        independent jobs fanned out to ``executor`` and yielded in
+        completion order.
+        Args:
+            profile: Active user profile used for multipliers.
+            countries: Destination countries keyed by country identifier.
+            *args: The eleven numeric inputs of ``calculate_comprehensive_roi``.
+            executor: Worker pool for the uncached countries; runs serially
+                in this process when omitted.
+            seed: Root seed for the Monte Carlo draws; defaults to ``self.seed``.
+        Returns:
+            An iterator over ``(country_key, result)`` pairs.
+        Side Effects:
+            Stores new results in ``result_cache``. Countries whose job fails
+            get fallback metrics and an error line on stdout.
+        """
+        inputs = self._normalize_inputs(*args)
+        seed = self.seed if seed is None else seed
+        pending = []
+        
+        for country_key, country in countries.items():
+            cache_key = self._result_cache_key(profile, country, seed, *inputs)
+            cached_result = self.result_cache.get(cache_key)
+            if cached_result is not None:
+                yield country_key, cached_result
+            else:
+                pending.append((country_key, cache_key, (self, profile, country, inputs, seed)))
+        
+        jobs = [job for _, _, job in pending]
+        if executor is None:
+            outcomes = ((index, _comprehensive_roi_job(job)) for index, job in enumerate(jobs))
+        else:
+            outcomes = executor.imap_completed(_comprehensive_roi_job, jobs)
+        
+        for index, (result, error) in outcomes:
+            country_key, cache_key, _ = pending[index]
+            if error is None:
+                self.result_cache.put(cache_key, result)
+            else:
+                print(f"ROI Calculation Error: {error}")
+                result = self._get_fallback_result(countries[country_key], inputs[9])
+            yield country_key, result
+    
+    def _normalize_inputs(self, current_revenue, current_margin, *args) -> Tuple:
+        """Input validation and normalization shared by every entry point"""
+        current_revenue = max(1000, float(current_revenue or 45000))
+        current_margin = max(1, min(95, float(current_margin or 25)))
+        return (current_revenue, current_margin) + tuple(args)
+    
+    def _compute_comprehensive_roi(self, profile, country, *args, seed=None) -> Dict:
+        """Uncached comprehensive calculation on normalized inputs.
+        Runs through the (profile, country) calculation graph, so only the
+        nodes downstream of inputs that changed since the last call for the
+        same pair are recomputed.
+        """
+        graph = self._calculation_graph(profile, country)
+        with graph.lock:
+            graph.set_inputs(seed=seed, **dict(zip(ROI_INPUT_NAMES, args)))
+            return copy.deepcopy(graph.get("result"))
+    
+    def _calculation_graph(self, profile, country) -> CalculationGraph:
+        """Cached calculation graph for a profile, country data and settings"""
+        key = (profile.id, profile.success_multiplier, country_fingerprint(country),
+               self._settings_key())
+        with self._graphs_lock:
+            graph = self._graphs.get(key)
+            if graph is None:
+                graph = self._build_calculation_graph(profile, country)
+                self._graphs[key] = graph
+                while len(self._graphs) > self.max_graphs:
+                    self._graphs.popitem(last=False)
+            self._graphs.move_to_end(key)
+        return graph
+    
+    def _build_calculation_graph(self, profile, country) -> CalculationGraph:
+        """Wire the comprehensive calculation as a dependency graph.
+        Nodes and what invalidates them:
+            incomes: the nine cash inputs (current and projected net income
+                and the monthly delta).
+            flow_kernel: time_horizon (weights, totals and payback do not
+                depend on the discount rate).
+            kernel: time_horizon and discount_rate (adds the discount vector).
+            flow_metrics: incomes and flow_kernel, including flows and IRR.
+            discount_metrics: incomes, kernel and discount_rate (NPV, MIRR,
+                profitability index).
+            monte_carlo_draws: the nine cash inputs and the seed. A failed
+                simulation only zeroes the ``monte_carlo`` statistics.
+            monte_carlo: the draws and kernel. In adaptive mode the draws
+                also depend on flow_kernel, since the stopping rule uses ROI.
+            sensitivity, scenarios: every input.
+        """
+        graph = CalculationGraph()
+        for name in ROI_INPUT_NAMES + ("seed",):
+            graph.add_input(name)
+        cash_inputs = ROI_INPUT_NAMES[:9]
+        flow_metrics = tuple(m for m in BASE_METRICS if m not in DISCOUNTED_METRICS)
+        
+        graph.add_node("incomes", cash_inputs,
+                       lambda *inputs: self._monthly_delta(profile, country, *inputs))
+        graph.add_node("flow_kernel", ("time_horizon",),
+                       lambda time_horizon: self._cash_flow_kernel(country, time_horizon, 0.0))
+        graph.add_node("kernel", ("time_horizon", "discount_rate"),
+                       lambda time_horizon, discount_rate: self._cash_flow_kernel(
+                           country, time_horizon, discount_rate))
+        graph.add_node("flow_metrics", ("incomes", "flow_kernel"),
+                       lambda incomes, kernel: self._base_metric_values(
+                           country, incomes, kernel, None, flow_metrics))
+        graph.add_node("discount_metrics", ("incomes", "kernel", "discount_rate"),
+                       lambda incomes, kernel, discount_rate: self._base_metric_values(
+                           country, incomes, kernel, discount_rate, DISCOUNTED_METRICS))
+        graph.add_node("base", ("flow_metrics", "discount_metrics"),
+                       lambda flows, discounted: {m: {**flows, **discounted}[m] for m in BASE_METRICS})
+        if self.adaptive_monte_carlo:
+            # The stopping rule looks at ROI, so the draws depend on the horizon
+            graph.add_node("monte_carlo_draws", cash_inputs + ("seed", "flow_kernel"),
+                           lambda *inputs: self._monte_carlo_draws(
+                               profile, country, inputs[:9], inputs[9], kernel=inputs[10]))
+        else:
+            graph.add_node("monte_carlo_draws", cash_inputs + ("seed",),
+                           lambda *inputs: self._monte_carlo_draws(
+                               profile, country, inputs[:9], inputs[9]))
+        graph.add_node("monte_carlo", ("monte_carlo_draws", "kernel"),
+                       lambda draws, kernel: self._monte_carlo_summary(country, draws, kernel))
+        graph.add_node("sensitivity", ROI_INPUT_NAMES,
+                       lambda *inputs: self._comprehensive_sensitivity_analysis(profile, country, *inputs))
+        graph.add_node("scenarios", ROI_INPUT_NAMES,
+                       lambda *inputs: self._scenario_analysis(profile, country, *inputs))
+        graph.add_node("risk_score", ("base",),
+                       lambda base: self._calculate_comprehensive_risk(country, profile, base))
+        graph.add_node("opportunity_score", ("base",),
+                       lambda base: self._calculate_opportunity_score(base, country, profile))
+        graph.add_node("result",
+                       ("base", "monte_carlo", "sensitivity", "scenarios", "risk_score", "opportunity_score"),
+                       lambda base, monte_carlo, sensitivity, scenarios, risk_score, opportunity_score: {
+                           **base,
+                           "monte_carlo": monte_carlo,
+                           "sensitivity": sensitivity,
+                           "scenarios": scenarios,
+                           "risk_score": risk_score,
+                           "opportunity_score": opportunity_score,
+                           "recommendation": self._generate_recommendation(base, risk_score, opportunity_score)
+                       })
+        return graph
+    
+    def _result_cache_key(self, profile, country, seed, *args) -> Tuple:
+        """Cache key from profile, country data, normalized inputs and seed"""
+        (current_revenue, current_margin, current_corp_tax, current_pers_tax,
+         current_living, current_business, revenue_multiplier, margin_improvement,
+         success_probability, time_horizon, discount_rate) = args
+        
+        inputs = tuple(round(float(value), 6) for value in (
+            current_revenue, current_margin, current_corp_tax, current_pers_tax,
+            current_living, current_business, revenue_multiplier, margin_improvement,
+            success_probability, discount_rate
+        ))
+        return (profile.id, profile.success_multiplier, country_fingerprint(country),
+                inputs, int(time_horizon), seed, self._settings_key())
+    
+    def _settings_key(self) -> Tuple:
+        """Calculator settings that change results, for cache and graph keys"""
+        return (self.monte_carlo_iterations, tuple(self.confidence_intervals),
+                self.histogram_bins, self.monthly_growth_rate, self.sampling,
+                self.adaptive_monte_carlo, self.monte_carlo_batch_size,
+                self.monte_carlo_max_iterations, self.mean_roi_tolerance,
+                self.quantile_tolerance, self.absolute_roi_tolerance)
+    
+    def _calculate_base_metrics(self, profile, country, *args,
+                                metrics: Optional[Tuple[str, ...]] = None) -> Dict:
+        """Enhanced base metrics calculation.
+        Args:
+            profile: Active user profile.
+            country: Destination country data.
+            *args: The eleven calculator inputs in ``ROI_INPUT_NAMES`` order.
+            metrics: Subset of ``BASE_METRICS`` to compute; ``None`` computes
+                all of them. Metrics that are not requested are never
+                evaluated, so callers that only need ROI or NPV skip the
+                IRR/MIRR solvers and the ``monthly_flows`` list.
+        Returns:
+            Dictionary with the requested metrics.
+        """
+        requested = BASE_METRICS if metrics is None else tuple(metrics)
+        unknown = set(requested) - set(BASE_METRICS)
+        if unknown:
+            raise ValueError(f"Unknown metrics: {sorted(unknown)}")
+        
         try:
             (current_revenue, current_margin, current_corp_tax, current_pers_tax,
              current_living, current_business, revenue_multiplier, margin_improvement,
              success_probability, time_horizon, discount_rate) = args
             
-            # Current situation analysis
-            current_profit = current_revenue * (current_margin / 100)
-            current_corp_after_tax = current_profit * (1 - current_corp_tax/100)
-            current_pers_after_tax = current_corp_after_tax * (1 - current_pers_tax/100)
-            current_net_income = current_pers_after_tax - current_living - current_business
-            
-            # Projected situation
-            success_factor = success_probability / 100
-            profile_multiplier = profile.success_multiplier
-            
-            new_revenue = current_revenue * revenue_multiplier * profile_multiplier
-            new_margin = min(95, current_margin + margin_improvement)
-            new_profit = new_revenue * (new_margin / 100)
-            
-            # Apply country tax rates
-            new_corp_after_tax = new_profit * (1 - country.corp_tax)
-            new_pers_after_tax = new_corp_after_tax * (1 - country.pers_tax)
-            new_net_income = new_pers_after_tax - country.living_cost - country.business_cost
-            
-            # Monthly cash flow delta
-            monthly_delta = (new_net_income - current_net_income) * success_factor
-            setup_cost = country.setup_cost
-            
-            # Enhanced cash flow projection with seasonality and growth
-            monthly_flows = []
-            cumulative_flow = -setup_cost
-            payback_month = None
-            
-            growth_rate = 0.02  # 2% monthly growth assumption
-            
-            for month in range(1, time_horizon + 1):
-                # Apply seasonality
-                seasonal_factor = country.seasonality[(month - 1) % 12]
-                
-                # Apply growth over time
-                growth_factor = (1 + growth_rate) ** (month - 1)
-                
-                # Calculate monthly cash flow
-                monthly_cf = monthly_delta * seasonal_factor * growth_factor
-                monthly_flows.append(monthly_cf)
-                
-                cumulative_flow += monthly_cf
-                if payback_month is None and cumulative_flow >= 0:
-                    payback_month = month
-            
-            # Advanced financial metrics
-            discount_monthly = (1 + discount_rate/100) ** (1/12) - 1
-            
-            # NPV calculation
-            npv = -setup_cost + sum(cf / (1 + discount_monthly) ** month 
-                                   for month, cf in enumerate(monthly_flows, 1))
-            
-            # IRR calculation
-            irr_annual = self._calculate_irr(setup_cost, monthly_flows) * 100
-            
-            # ROI and other metrics
-            total_return = sum(monthly_flows)
-            roi_percentage = (total_return / setup_cost) * 100 if setup_cost > 0 else 0
+            # Current vs projected situation and the monthly cash flow delta
+            current_net_income, new_net_income, monthly_delta = self._monthly_delta(
+                profile, country, current_revenue, current_margin,
+                current_corp_tax, current_pers_tax, current_living, current_business,
+                revenue_multiplier, margin_improvement, success_probability
+            )
             
-            # Additional metrics
-            profitability_index = (npv + setup_cost) / setup_cost if setup_cost > 0 else 1
-            mirr = self._calculate_mirr(setup_cost, monthly_flows, discount_rate/100) * 100
-            
-            return {
-                "npv": npv,
-                "roi": roi_percentage,
-                "irr_annual": irr_annual,
-                "mirr_annual": mirr,
-                "payback_months": payback_month or float('inf'),
-                "payback_years": (payback_month / 12) if payback_month else float('inf'),
-                "monthly_delta": monthly_delta,
-                "total_return": total_return,
-                "monthly_flows": monthly_flows,
-                "setup_cost": setup_cost,
-                "profitability_index": profitability_index,
-                "current_net_income": current_net_income,
-                "projected_net_income": new_net_income
-            }
+            # Cash flow projection with seasonality and growth from cached vectors
+            kernel = self._cash_flow_kernel(country, time_horizon, discount_rate)
+            incomes = (current_net_income, new_net_income, monthly_delta)
+            return self._base_metric_values(country, incomes, kernel, discount_rate, requested)
             
         except Exception as e:
             print(f"Base metrics calculation error: {e}")
             return self._get_fallback_result(country, time_horizon)
     
-    def _advanced_monte_carlo(self, profile, country, *args) -> Dict:
-        """Advanced Monte Carlo simulation with correlated variables"""
+    def _base_metric_values(self, country, incomes: Tuple, kernel: CashFlowKernel,
+                            discount_rate: Optional[float], requested: Tuple[str, ...]) -> Dict:
+        """Requested base metrics from the income triple and a cash flow kernel.
+        Metrics outside ``DISCOUNTED_METRICS`` only use the kernel's weights,
+        so for those any kernel of the right horizon (and a ``None`` discount
+        rate) will do.
+        """
+        current_net_income, new_net_income, monthly_delta = incomes
+        setup_cost = country.setup_cost
+        
+        # Each metric is evaluated on first use, so unrequested ones cost nothing
+        evaluators = {
+            "flows": lambda: kernel.flows(monthly_delta),
+            "payback_month": lambda: float(kernel.payback_months(monthly_delta, setup_cost)),
+            "npv": lambda: kernel.npv(monthly_delta, setup_cost),
+            "roi": lambda: (value("total_return") / setup_cost) * 100 if setup_cost > 0 else 0,
+            "irr_annual": lambda: self._calculate_irr(setup_cost, value("flows")) * 100,
+            "mirr_annual": lambda: self._calculate_mirr(setup_cost, value("flows"), discount_rate/100) * 100,
+            "payback_months": lambda: (int(value("payback_month"))
+                                       if value("payback_month") != float('inf')
+                                       else value("payback_month")),
+            "payback_years": lambda: value("payback_month") / 12,
+            "monthly_delta": lambda: monthly_delta,
+            "total_return": lambda: kernel.total_return(monthly_delta),
+            "monthly_flows": lambda: value("flows").tolist(),
+            "setup_cost": lambda: setup_cost,
+            "profitability_index": lambda: (value("npv") + setup_cost) / setup_cost if setup_cost > 0 else 1,
+            "current_net_income": lambda: current_net_income,
+            "projected_net_income": lambda: new_net_income
+        }
+        computed = {}
+        
+        def value(name):
+            if name not in computed:
+                computed[name] = evaluators[name]()
+            return computed[name]
+        
+        return {name: value(name) for name in requested}
+    
+    def _monthly_delta(self, profile, country, current_revenue, current_margin,
+                       current_corp_tax, current_pers_tax, current_living, current_business,
+                       revenue_multiplier, margin_improvement, success_probability,
+                       living_cost=None) -> Tuple:
+        """Current net income, projected net income and monthly cash flow delta.
+        Every numeric input may be a scalar or a NumPy array; arrays broadcast
+        so a whole batch of simulated inputs is evaluated in one pass.
+        """
+        if living_cost is None:
+            living_cost = country.living_cost
+        
+        # Current situation analysis
+        current_profit = current_revenue * (current_margin / 100)
+        current_corp_after_tax = current_profit * (1 - current_corp_tax/100)
+        current_pers_after_tax = current_corp_after_tax * (1 - current_pers_tax/100)
+        current_net_income = current_pers_after_tax - current_living - current_business
+        
+        # Projected situation
+        success_factor = success_probability / 100
+        new_revenue = current_revenue * revenue_multiplier * profile.success_multiplier
+        new_margin = np.minimum(95, current_margin + margin_improvement)
+        new_profit = new_revenue * (new_margin / 100)
+        
+        # Apply country tax rates
+        new_corp_after_tax = new_profit * (1 - country.corp_tax)
+        new_pers_after_tax = new_corp_after_tax * (1 - country.pers_tax)
+        new_net_income = new_pers_after_tax - living_cost - country.business_cost
+        
+        monthly_delta = (new_net_income - current_net_income) * success_factor
+        return current_net_income, new_net_income, monthly_delta
+    
+    def _cash_flow_kernel(self, country, time_horizon: int, discount_rate: float) -> CashFlowKernel:
+        """Cached cash flow vectors for a country, horizon and discount rate"""
+        return build_cash_flow_kernel(
+            tuple(country.seasonality), int(time_horizon),
+            float(discount_rate), self.monthly_growth_rate
+        )
+    
+    def _advanced_monte_carlo(self, profile, country, *args, rng=None) -> Dict:
+        """Vectorized Monte Carlo simulation with correlated variables.
+        All iterations are drawn as arrays at once. Every simulated cash flow
+        row is ``monthly_delta * weights``, so the (iterations x months) flow
+        matrix is rank one and the cached ``CashFlowKernel`` turns NPV, ROI
+        and payback into whole-array operations. The simulated ROI
+        distribution is returned pre-binned under ``roi_histogram`` so charts
+        plot the real (possibly skewed) shape without shipping every sample.
+        """
         try:
-            results = []
-            
-            for _ in range(self.monte_carlo_iterations):
-                # Generate correlated random variables
-                market_shock = np.random.normal(0, 0.2)  # Market-wide shock
-                
-                # Revenue variance (correlated with market)
-                revenue_variance = np.random.normal(1.0, 0.18) + market_shock * 0.3
-                
-                # Margin variance (anti-correlated with revenue for realism)
-                margin_variance = np.random.normal(1.0, 0.12) - revenue_variance * 0.1
-                
-                # Success probability variance
-                success_variance = np.random.beta(8, 2) * 1.2  # Skewed distribution
-                
-                # Cost inflation
-                cost_inflation = max(0.8, np.random.normal(1.0, 0.15))
-                
-                # Modify inputs
-                modified_args = list(args)
-                modified_args[0] *= max(0.3, revenue_variance)  # revenue
-                modified_args[1] *= max(0.5, margin_variance)   # margin
-                modified_args[7] *= max(0.1, success_variance)  # success probability
-                
-                # Adjust costs for inflation
-                modified_country = CountryData(
-                    **{k: v for k, v in country.__dict__.items() if k != 'living_cost'},
-                    living_cost=country.living_cost * cost_inflation
+            time_horizon, discount_rate = args[9], args[10]
+            kernel = self._cash_flow_kernel(country, time_horizon, discount_rate)
+            if self.adaptive_monte_carlo:
+                monthly_delta = self._adaptive_monte_carlo_deltas(
+                    profile, country, *args[:9], kernel=kernel, rng=rng
                 )
-                
-                result = self._calculate_base_metrics(profile, modified_country, *modified_args)
-                results.append(result)
+            else:
+                monthly_delta = self._monte_carlo_deltas(profile, country, *args[:9], rng=rng)
+            return self._monte_carlo_summary(country, monthly_delta, kernel)
             
-            # Extract key metrics
-            rois = [r['roi'] for r in results]
-            npvs = [r['npv'] for r in results]
-            paybacks = [r['payback_years'] for r in results if r['payback_years'] != float('inf')]
+        except Exception as e:
+            print(f"Monte Carlo simulation error: {e}")
+            return {"mean_roi": 0, "std_roi": 0, "probability_positive_roi": 0}
+    
+    def _monte_carlo_deltas(self, profile, country, current_revenue, current_margin,
+                            current_corp_tax, current_pers_tax, current_living, current_business,
+                            revenue_multiplier, margin_improvement, success_probability,
+                            rng=None, iterations: Optional[int] = None) -> np.ndarray:
+        """Simulated monthly cash flow deltas, one per iteration.
+        The draws do not depend on the horizon or discount rate, which only
+        enter through the kernel in ``_monte_carlo_summary``. ``iterations``
+        defaults to ``monte_carlo_iterations``.
+        Drivers are one correlated block drawn from the country's
+        ``DriverModel``.
+        """
+        iterations = self.monte_carlo_iterations if iterations is None else iterations
+        rng = rng if rng is not None else make_rng(self.seed, "monte_carlo", country.name)
+        
+        drivers = self._driver_model(country).sample(
+            self._driver_normals(iterations, len(DRIVER_NAMES), rng)
+        )
+        return self._driver_deltas(
+            profile, country, drivers, current_revenue, current_margin,
+            current_corp_tax, current_pers_tax, current_living, current_business,
+            revenue_multiplier, margin_improvement, success_probability
+        )
+    
+    def _driver_deltas(self, profile, country, drivers: Tuple[np.ndarray, ...],
+                       current_revenue, current_margin, current_corp_tax, current_pers_tax,
+                       current_living, current_business, revenue_multiplier,
+                       margin_improvement, success_probability) -> np.ndarray:
+        """Monthly deltas with inputs perturbed by sampled driver multipliers"""
+        revenue_variance, margin_variance, success_variance, cost_inflation = drivers
+        
+        # Modified inputs for the whole batch
+        _, _, monthly_delta = self._monthly_delta(
+            profile, country,
+            current_revenue * np.maximum(0.3, revenue_variance),
+            current_margin * np.maximum(0.5, margin_variance),
+            current_corp_tax, current_pers_tax, current_living, current_business,
+            revenue_multiplier, margin_improvement,
+            success_probability * np.maximum(0.1, success_variance),
+            living_cost=country.living_cost * cost_inflation
+        )
+        return monthly_delta
+    
+    def _driver_normals(self, iterations: int, dimensions: int, rng,
+                        sampling: Optional[str] = None) -> np.ndarray:
+        """Independent standard normals drawn with the configured sampling strategy.
+        ``"pseudo"`` draws from the generator directly; the other strategies
+        map stratified or quasi-random uniforms through the inverse CDF.
+        ``sampling`` overrides the strategy resolved by ``_sampling_for``.
+        """
+        sampling = sampling or self._sampling_for(dimensions)
+        if sampling == "pseudo":
+            return rng.standard_normal((iterations, dimensions))
+        return inverse_normal_cdf(sample_uniforms(sampling, iterations, dimensions, rng))
+    
+    def _sampling_for(self, dimensions: int) -> str:
+        """Sampling strategy usable for ``dimensions`` coordinates.
+        Sobol direction numbers only cover ``SOBOL_MAX_DIMENSIONS``
+        coordinates; larger draws (e.g. portfolios of two or more
+        countries) fall back to Latin hypercube sampling with a warning.
+        """
+        if self.sampling == "sobol" and dimensions > SOBOL_MAX_DIMENSIONS:
+            print(f"Sobol sampling supports up to {SOBOL_MAX_DIMENSIONS} dimensions; "
+                  f"using Latin hypercube sampling for {dimensions}")
+            return "lhs"
+        return self.sampling
+    
+    def _driver_model(self, country) -> DriverModel:
+        """Country driver model, with volatilities scaled by its risk factors if it opts in"""
+        model = country.driver_model if country.driver_model is not None else DriverModel()
+        return model.for_risk(country.risk_factors)
+    
+    def _adaptive_monte_carlo_deltas(self, profile, country, *inputs, kernel: CashFlowKernel,
+                                     rng=None) -> np.ndarray:
+        """Simulate batches of deltas until ROI statistics converge.
+        After each batch of ``monte_carlo_batch_size`` draws the confidence
+        half-widths of mean ROI and the tail percentiles are checked
+        against the tolerances (see ``_monte_carlo_converged``); drawing
+        stops once they pass or ``monte_carlo_max_iterations`` is reached.
+        Args:
+            profile: Active user profile.
+            country: Destination country data.
+            *inputs: The first nine calculator inputs.
+            kernel: Cash flow kernel for the horizon; only its weights are used.
+            rng: Random generator; defaults to the country's seeded stream.
+        Returns:
+            Simulated monthly deltas for every draw taken.
+        """
+        rng = rng if rng is not None else make_rng(self.seed, "monte_carlo", country.name)
+        setup_cost = country.setup_cost
+        batches = []
+        drawn = 0
+        
+        while True:
+            batch = min(self.monte_carlo_batch_size, self.monte_carlo_max_iterations - drawn)
+            batches.append(self._monte_carlo_deltas(profile, country, *inputs, rng=rng, iterations=batch))
+            drawn += batch
+            monthly_delta = np.concatenate(batches)
+            
+            if drawn >= self.monte_carlo_max_iterations or setup_cost <= 0:
+                return monthly_delta
+            rois = kernel.total_return(monthly_delta) / setup_cost * 100
+            if self._monte_carlo_converged(rois, self._monte_carlo_errors(rois)):
+                return monthly_delta
+    
+    def _monte_carlo_errors(self, rois: np.ndarray) -> Dict:
+        """Standard errors of mean ROI and the tail percentiles.
+        Percentile errors use the asymptotic ``sqrt(p(1-p)/n) / f(q_p)``
+        with the density ``f`` estimated from neighbouring quantiles.
+        """
+        iterations = len(rois)
+        errors = {"mean_roi": float(np.std(rois) / np.sqrt(iterations))}
+        
+        for p in MONTE_CARLO_TAIL_PERCENTILES:
+            lower, upper = np.quantile(rois, [p - 0.01, p + 0.01])
+            spread = upper - lower
+            # Density ~ 0.02 / spread, so the error is spread * sqrt(p(1-p)/n) / 0.02
+            errors[f"roi_{int(p*100)}"] = float(spread * np.sqrt(p * (1 - p) / iterations) / 0.02)
+        return errors
+    
+    def _monte_carlo_converged(self, rois: np.ndarray, errors: Dict) -> bool:
+        """Whether every 95% confidence half-width is within its tolerance.
+        Mean ROI passes when ``1.96 * error <= max(absolute_roi_tolerance,
+        mean_roi_tolerance * |mean ROI|)``; the absolute floor keeps results
+        with mean ROI near zero from running to the iteration cap. The tail
+        percentiles pass when ``1.96 * error <= quantile_tolerance * std ROI``
+        and at least ``monte_carlo_iterations`` draws were taken, so adaptive
+        tails are never less precise than a fixed run.
+        """
+        scale = abs(np.mean(rois))
+        if 1.96 * errors["mean_roi"] > max(self.absolute_roi_tolerance, self.mean_roi_tolerance * scale):
+            return False
+        if len(rois) < self.monte_carlo_iterations:
+            return False
+        limit = self.quantile_tolerance * np.std(rois)
+        return all(1.96 * errors[f"roi_{int(p*100)}"] <= limit for p in MONTE_CARLO_TAIL_PERCENTILES)
+    
+    def _monte_carlo_draws(self, profile, country, inputs: Tuple, seed,
+                           kernel: Optional[CashFlowKernel] = None) -> Optional[np.ndarray]:
+        """Simulated monthly deltas for the graph's draws node.
+        Returns ``None`` (and logs the error) if the simulation fails, so the
+        rest of the comprehensive result is still produced.
+        """
+        try:
+            rng = make_rng(seed, "monte_carlo", country.name)
+            if self.adaptive_monte_carlo:
+                return self._adaptive_monte_carlo_deltas(profile, country, *inputs, kernel=kernel, rng=rng)
+            return self._monte_carlo_deltas(profile, country, *inputs, rng=rng)
+            
+        except Exception as e:
+            print(f"Monte Carlo simulation error: {e}")
+            return None
+    
+    def _monte_carlo_summary(self, country, monthly_delta: Optional[np.ndarray],
+                             kernel: CashFlowKernel) -> Dict:
+        """Distribution statistics of simulated deltas under a cash flow kernel"""
+        if monthly_delta is None:
+            # The simulation failed and has already been logged
+            return {"mean_roi": 0, "std_roi": 0, "probability_positive_roi": 0}
+        try:
+            # Key metrics for every iteration
+            setup_cost = country.setup_cost
+            total_returns = kernel.total_return(monthly_delta)
+            rois = (total_returns / setup_cost) * 100 if setup_cost > 0 else np.zeros(len(monthly_delta))
+            npvs = kernel.npv(monthly_delta, setup_cost)
+            payback_months = kernel.payback_months(monthly_delta, setup_cost)
+            paybacks = payback_months[np.isfinite(payback_months)] / 12
             
             # Calculate comprehensive statistics
             confidence_intervals = {}
@@ -1219,66 +2290,305 @@ class AdvancedROICalculator:
                 confidence_intervals[f'roi_{int(ci*100)}'] = np.percentile(rois, ci * 100)
                 confidence_intervals[f'npv_{int(ci*100)}'] = np.percentile(npvs, ci * 100)
             
+            mean_roi = np.mean(rois)
+            std_roi = np.std(rois)
+            var_95 = np.percentile(rois, 5)  # Value at Risk
+            counts, bin_edges = np.histogram(rois, bins=self.histogram_bins)
+            standard_errors = self._monte_carlo_errors(rois)
+            
             return {
-                "mean_roi": np.mean(rois),
+                "mean_roi": mean_roi,
                 "median_roi": np.median(rois),
-                "std_roi": np.std(rois),
-                "skew_roi": float(np.mean(((np.array(rois) - np.mean(rois)) / np.std(rois)) ** 3)),
+                "std_roi": std_roi,
+                "skew_roi": float(np.mean(((rois - mean_roi) / std_roi) ** 3)),
                 "mean_npv": np.mean(npvs),
                 "std_npv": np.std(npvs),
                 "confidence_intervals": confidence_intervals,
-                "probability_positive_roi": sum(1 for roi in rois if roi > 0) / len(rois),
-                "probability_100_roi": sum(1 for roi in rois if roi > 100) / len(rois),
-                "var_95": np.percentile(rois, 5),  # Value at Risk
-                "expected_shortfall": np.mean([roi for roi in rois if roi <= np.percentile(rois, 5)]),
-                "mean_payback": np.mean(paybacks) if paybacks else float('inf')
+                "probability_positive_roi": float(np.mean(rois > 0)),
+                "probability_100_roi": float(np.mean(rois > 100)),
+                "var_95": var_95,
+                "expected_shortfall": np.mean(rois[rois <= var_95]),
+                "mean_payback": np.mean(paybacks) if paybacks.size else float('inf'),
+                "roi_histogram": {
+                    "bin_edges": bin_edges.tolist(),
+                    "counts": counts.tolist()
+                },
+                "iterations": len(rois),
+                "standard_errors": standard_errors,
+                "converged": self._monte_carlo_converged(rois, standard_errors)
             }
             
         except Exception as e:
             print(f"Monte Carlo simulation error: {e}")
             return {"mean_roi": 0, "std_roi": 0, "probability_positive_roi": 0}
     
-    def _comprehensive_sensitivity_analysis(self, profile, country, *args) -> Dict:
-        """Comprehensive sensitivity analysis"""
+    def calculate_portfolio(self, profile: UserProfile, countries: Dict[str, CountryData],
+                            weights: Dict[str, float], *args, seed: Optional[int] = None) -> Dict:
+        """Jointly simulate operations split across several countries.
+        One batched draw matrix holds a market factor shared by every
+        country plus an independent driver block per country, so the
+        countries co-move through the market exactly as their
+        ``DriverModel.market_loadings`` say, and adding a country only adds
+        its own block and a vectorized transform. The joint draw always
+        has ``monte_carlo_iterations`` rows; ``adaptive_monte_carlo`` does
+        not apply here.
+        Args:
+            profile: Active user profile used for multipliers.
+            countries: Country data keyed by country identifier.
+            weights: Capital allocation per country identifier; normalized
+                to sum to one.
+            *args: The eleven calculator inputs in ``ROI_INPUT_NAMES`` order.
+            seed: Root seed; defaults to the calculator's ``seed``.
+        Returns:
+            Portfolio ROI distribution statistics (mean, std, ``var_95``,
+            expected shortfall, histogram), per-country standalone
+            statistics, pairwise ROI correlations and the diversification
+            benefit versus the weighted standalone figures, plus the
+            ``sampling`` strategy actually used.
+        Side Effects:
+            Logs a warning when Sobol sampling falls back to Latin hypercube
+            for too many dimensions. Logs an error to stdout and returns an
+            empty dict on failure.
+        """
         try:
-            base_result = self._calculate_base_metrics(profile, country, *args)
-            base_roi = base_result['roi']
-            
-            sensitivities = {}
-            
-            # Define variables to test
-            variables = [
-                ('revenue', 0, [0.8, 0.9, 1.1, 1.2, 1.3]),
-                ('margin', 1, [-5, -2, 2, 5, 8]),
-                ('revenue_multiplier', 6, [0.8, 1.0, 1.5, 2.0, 2.5]),
-                ('margin_improvement', 7, [-5, 0, 5, 10, 15]),
-                ('success_probability', 8, [50, 65, 80, 90, 95])
-            ]
+            keys = [key for key in countries if weights.get(key, 0) > 0]
+            if not keys:
+                raise ValueError("Portfolio needs at least one positively weighted country")
+            allocation = np.array([weights[key] for key in keys], dtype=float)
+            allocation /= allocation.sum()
+            
+            inputs = self._normalize_inputs(*args)
+            time_horizon, discount_rate = inputs[9], inputs[10]
+            seed = self.seed if seed is None else seed
+            rng = make_rng(seed, "portfolio", *sorted(keys))
+            iterations = self.monte_carlo_iterations
+            
+            # Column 0 is the shared market factor, then one driver block per country
+            block = len(DRIVER_NAMES)
+            dimensions = 1 + block * len(keys)
+            sampling = self._sampling_for(dimensions)
+            normals = self._driver_normals(iterations, dimensions, rng, sampling)
+            market = normals[:, 0]
+            
+            rois = np.empty((len(keys), iterations))
+            npvs = np.empty((len(keys), iterations))
+            for i, key in enumerate(keys):
+                country = countries[key]
+                drivers = self._driver_model(country).sample_with_market(
+                    market, normals[:, 1 + block * i:1 + block * (i + 1)]
+                )
+                monthly_delta = self._driver_deltas(profile, country, drivers, *inputs[:9])
+                kernel = self._cash_flow_kernel(country, time_horizon, discount_rate)
+                setup_cost = country.setup_cost
+                rois[i] = (kernel.total_return(monthly_delta) / setup_cost * 100
+                           if setup_cost > 0 else 0.0)
+                npvs[i] = kernel.npv(monthly_delta, setup_cost)
+            
+            portfolio_rois = allocation @ rois
+            portfolio_npvs = allocation @ npvs
+            var_95 = np.percentile(portfolio_rois, 5)
+            standalone_var = np.percentile(rois, 5, axis=1)
+            standalone_std = np.std(rois, axis=1)
+            std_roi = np.std(portfolio_rois)
+            counts, bin_edges = np.histogram(portfolio_rois, bins=self.histogram_bins)
             
-            for var_name, var_index, test_values in variables:
-                sensitivities[var_name] = {}
-                
-                for test_value in test_values:
-                    try:
-                        modified_args = list(args)
-                        
-                        if var_name in ['revenue', 'revenue_multiplier']:
-                            modified_args[var_index] = args[var_index] * test_value
-                        else:
-                            modified_args[var_index] = test_value
-                        
-                        result = self._calculate_base_metrics(profile, country, *modified_args)
-                        sensitivities[var_name][str(test_value)] = result['roi']
-                    except:
-                        sensitivities[var_name][str(test_value)] = base_roi
+            return {
+                "weights": dict(zip(keys, allocation.tolist())),
+                "iterations": iterations,
+                "sampling": sampling,
+                "mean_roi": float(np.mean(portfolio_rois)),
+                "median_roi": float(np.median(portfolio_rois)),
+                "std_roi": float(std_roi),
+                "mean_npv": float(np.mean(portfolio_npvs)),
+                "var_95": float(var_95),
+                "expected_shortfall": float(np.mean(portfolio_rois[portfolio_rois <= var_95])),
+                "probability_positive_roi": float(np.mean(portfolio_rois > 0)),
+                "countries": {
+                    key: {
+                        "weight": float(allocation[i]),
+                        "mean_roi": float(np.mean(rois[i])),
+                        "std_roi": float(standalone_std[i]),
+                        "var_95": float(standalone_var[i])
+                    }
+                    for i, key in enumerate(keys)
+                },
+                "roi_correlation": (np.corrcoef(rois).tolist() if len(keys) > 1 else [[1.0]]),
+                "diversification_benefit": {
+                    # Portfolio VaR above the weighted standalone VaRs
+                    "var_95": float(var_95 - allocation @ standalone_var),
+                    # Share of weighted standalone volatility diversified away
+                    "volatility": float(1 - std_roi / (allocation @ standalone_std))
+                                  if allocation @ standalone_std > 0 else 0.0
+                },
+                "roi_histogram": {
+                    "bin_edges": bin_edges.tolist(),
+                    "counts": counts.tolist()
+                }
+            }
             
-            return sensitivities
+        except Exception as e:
+            print(f"Portfolio simulation error: {e}")
+            return {}
+    
+    def sensitivity_grid(self, profile, country, *args, points: Optional[int] = None,
+                         metrics: Tuple[str, ...] = ("roi",)) -> Dict:
+        """One-at-a-time sensitivity of selected metrics over a test grid.
+        Every perturbation of every variable is stacked into one input matrix
+        and evaluated in a single vectorized pass, so a fine grid (e.g. 50
+        points per variable) costs about the same as the default one.
+        Args:
+            profile: Active user profile.
+            country: Destination country data.
+            *args: The eleven calculator inputs in ``ROI_INPUT_NAMES`` order.
+            points: Test values per variable spread evenly over the default
+                range; ``None`` uses the default test values.
+            metrics: Metrics to evaluate, any of those supported by
+                ``_grid_metrics``.
+        Returns:
+            Mapping of variable name to ``{"values": [...], metric: ndarray}``.
+        """
+        base = np.asarray(args[:9], dtype=float)
+        time_horizon, discount_rate = args[9], args[10]
+        
+        grids = []
+        for name, index, test_values, relative in SENSITIVITY_VARIABLES:
+            if points is not None:
+                test_values = [round(float(v), 6) for v in
+                               np.linspace(min(test_values), max(test_values), points)]
+            grids.append((name, index, list(test_values), relative))
+        
+        # One row per (variable, test value) with every other input at base
+        inputs = np.tile(base, (sum(len(values) for _, _, values, _ in grids), 1))
+        row = 0
+        for _, index, values, relative in grids:
+            column = np.asarray(values, dtype=float)
+            inputs[row:row + len(values), index] = base[index] * column if relative else column
+            row += len(values)
+        
+        evaluated = self._grid_metrics(profile, country, inputs, time_horizon,
+                                       discount_rate, metrics)
+        
+        sensitivities = {}
+        row = 0
+        for name, _, values, _ in grids:
+            rows = slice(row, row + len(values))
+            sensitivities[name] = {"values": values,
+                                   **{metric: evaluated[metric][rows] for metric in metrics}}
+            row += len(values)
+        return sensitivities
+    
+    def calculate_sensitivity_surface(self, profile, country, *args,
+                                      x_variable: str, x_values,
+                                      y_variable: str, y_values,
+                                      metric: str = "roi") -> Dict:
+        """Evaluate a metric over the full 2-D grid of two inputs.
+        The grid is broadcast through ``_monthly_delta`` as one array
+        operation, so interaction effects over e.g. a 200 x 200 grid of
+        ``revenue_multiplier`` x ``success_probability`` cost a few
+        milliseconds. ``time_horizon`` and ``discount_rate`` axes are also
+        supported; they only select a different cached cash flow kernel.
+        Args:
+            profile: Active user profile.
+            country: Destination country data.
+            *args: The eleven calculator inputs in ``ROI_INPUT_NAMES`` order.
+            x_variable: Input name (from ``ROI_INPUT_NAMES``) on the x axis.
+            x_values: Absolute test values for ``x_variable``.
+            y_variable: Input name on the y axis.
+            y_values: Absolute test values for ``y_variable``.
+            metric: One of ``roi``, ``npv``, ``total_return``,
+                ``profitability_index`` or ``monthly_delta``.
+        Returns:
+            Dictionary with the axis names and values, the metric name and a
+            ``values`` array shaped ``(len(y_values), len(x_values))``.
+        """
+        if x_variable not in ROI_INPUT_NAMES or y_variable not in ROI_INPUT_NAMES:
+            raise ValueError(f"Surface axes must be inputs from ROI_INPUT_NAMES, "
+                             f"got {x_variable!r} and {y_variable!r}")
+        if x_variable == y_variable:
+            raise ValueError("Surface axes must be two different inputs")
+        if metric not in ("roi", "npv", "total_return", "profitability_index", "monthly_delta"):
+            raise ValueError(f"Unsupported surface metric: {metric!r}")
+        
+        x_values = np.asarray(x_values, dtype=float)
+        y_values = np.asarray(y_values, dtype=float)
+        x_grid, y_grid = np.meshgrid(x_values, y_values)
+        
+        inputs = [np.full(x_grid.shape, float(value)) for value in args]
+        inputs[ROI_INPUT_NAMES.index(x_variable)] = x_grid
+        inputs[ROI_INPUT_NAMES.index(y_variable)] = y_grid
+        _, _, monthly_delta = self._monthly_delta(profile, country, *inputs[:9])
+        
+        # One cached kernel per distinct (horizon, discount) pair on the grid
+        shape_keys = np.stack([np.rint(inputs[9]), inputs[10]], axis=-1).reshape(-1, 2)
+        unique_keys, inverse = np.unique(shape_keys, axis=0, return_inverse=True)
+        kernels = [self._cash_flow_kernel(country, int(horizon), discount)
+                   for horizon, discount in unique_keys]
+        total_weight = np.array([k.total_weight for k in kernels])[inverse].reshape(x_grid.shape)
+        npv_weight = np.array([k.npv_weight for k in kernels])[inverse].reshape(x_grid.shape)
+        
+        setup_cost = country.setup_cost
+        total_return = monthly_delta * total_weight
+        npv = monthly_delta * npv_weight - setup_cost
+        values = {
+            "monthly_delta": monthly_delta,
+            "total_return": total_return,
+            "npv": npv,
+            "roi": total_return / setup_cost * 100 if setup_cost > 0 else np.zeros_like(total_return),
+            "profitability_index": (npv + setup_cost) / setup_cost if setup_cost > 0 else np.ones_like(npv)
+        }[metric]
+        
+        return {
+            "x_variable": x_variable,
+            "x_values": x_values,
+            "y_variable": y_variable,
+            "y_values": y_values,
+            "metric": metric,
+            "values": values
+        }
+    
+    def _grid_metrics(self, profile, country, inputs: np.ndarray, time_horizon: int,
+                      discount_rate: float, metrics: Tuple[str, ...]) -> Dict[str, np.ndarray]:
+        """Selected metrics for every row of an (n x 9) matrix of the first nine inputs.
+        Supported metrics are ``roi``, ``npv``, ``total_return``,
+        ``monthly_delta``, ``payback_months``, ``irr_annual`` and
+        ``mirr_annual``; the IRR/MIRR solvers only run when asked for.
+        """
+        _, _, monthly_delta = self._monthly_delta(profile, country, *np.asarray(inputs, dtype=float).T)
+        setup_cost = country.setup_cost
+        kernel = self._cash_flow_kernel(country, time_horizon, discount_rate)
+        
+        evaluators = {
+            "monthly_delta": lambda: monthly_delta,
+            "total_return": lambda: kernel.total_return(monthly_delta),
+            "roi": lambda: (kernel.total_return(monthly_delta) / setup_cost * 100
+                            if setup_cost > 0 else np.zeros_like(monthly_delta)),
+            "npv": lambda: kernel.npv(monthly_delta, setup_cost),
+            "payback_months": lambda: kernel.payback_months(monthly_delta, setup_cost),
+            "irr_annual": lambda: self._batch_irr(setup_cost, kernel.flows(monthly_delta)) * 100,
+            "mirr_annual": lambda: self._batch_mirr(setup_cost, kernel.flows(monthly_delta),
+                                                    discount_rate / 100) * 100
+        }
+        unknown = set(metrics) - set(evaluators)
+        if unknown:
+            raise ValueError(f"Unknown metrics: {sorted(unknown)}")
+        return {metric: evaluators[metric]() for metric in metrics}
+    
+    def _comprehensive_sensitivity_analysis(self, profile, country, *args,
+                                            points: Optional[int] = None) -> Dict:
+        """ROI sensitivity per variable, keyed by test value, from one batched grid"""
+        try:
+            grid = self.sensitivity_grid(profile, country, *args, points=points)
+            return {
+                name: {str(value): float(roi) for value, roi in zip(data["values"], data["roi"])}
+                for name, data in grid.items()
+            }
             
         except Exception as e:
             print(f"Sensitivity analysis error: {e}")
             return {}
     
-    def _scenario_analysis(self, profile, country, *args) -> Dict:
+    def _scenario_analysis(self, profile, country, *args,
+                           metrics: Tuple[str, ...] = SCENARIO_METRICS) -> Dict:
         """Three scenario analysis: pessimistic, realistic, optimistic"""
         try:
             scenarios = {}
@@ -1289,10 +2599,10 @@ class AdvancedROICalculator:
             pessimistic_args[7] *= 0.8   # Lower margin improvement  
             pessimistic_args[8] *= 0.6   # Lower success probability
             
-            scenarios['pessimistic'] = self._calculate_base_metrics(profile, country, *pessimistic_args)
+            scenarios['pessimistic'] = self._calculate_base_metrics(profile, country, *pessimistic_args, metrics=metrics)
             
             # Realistic scenario (base case)
-            scenarios['realistic'] = self._calculate_base_metrics(profile, country, *args)
+            scenarios['realistic'] = self._calculate_base_metrics(profile, country, *args, metrics=metrics)
             
             # Optimistic scenario
             optimistic_args = list(args)
@@ -1300,7 +2610,7 @@ class AdvancedROICalculator:
             optimistic_args[7] *= 1.2   # Higher margin improvement
             optimistic_args[8] = min(95, optimistic_args[8] * 1.1)  # Higher success probability
             
-            scenarios['optimistic'] = self._calculate_base_metrics(profile, country, *optimistic_args)
+            scenarios['optimistic'] = self._calculate_base_metrics(profile, country, *optimistic_args, metrics=metrics)
             
             return scenarios
             
@@ -1309,74 +2619,126 @@ class AdvancedROICalculator:
             return {}
     
     def _calculate_irr(self, initial_investment: float, cash_flows: List[float]) -> float:
-        """Calculate Internal Rate of Return using Newton-Raphson method"""
+        """Calculate Internal Rate of Return for a single cash flow series"""
         try:
-            def npv_function(rate):
-                return -initial_investment + sum(cf / (1 + rate) ** (month/12) 
-                                               for month, cf in enumerate(cash_flows, 1))
-            
-            def npv_derivative(rate):
-                return sum(-cf * (month/12) / (1 + rate) ** (month/12 + 1)
-                          for month, cf in enumerate(cash_flows, 1))
-            
-            rate = 0.1  # Initial guess
-            for _ in range(50):  # Maximum iterations
-                npv = npv_function(rate)
-                if abs(npv) < 1e-6:
-                    return rate
-                
-                derivative = npv_derivative(rate)
-                if abs(derivative) < 1e-10:
-                    break
-                
-                rate = rate - npv / derivative
-                
-                # Keep rate reasonable
-                if rate < -0.99 or rate > 10:
-                    return 0
-            
-            return rate if abs(npv_function(rate)) < 1000 else 0
-            
+            return float(self._batch_irr(initial_investment, np.atleast_2d(cash_flows))[0])
         except:
             return 0
     
     def _calculate_mirr(self, initial_investment: float, cash_flows: List[float], 
                        discount_rate: float) -> float:
-        """Calculate Modified Internal Rate of Return"""
+        """Calculate Modified Internal Rate of Return for a single cash flow series"""
         try:
-            positive_flows = [max(0, cf) for cf in cash_flows]
-            negative_flows = [min(0, cf) for cf in cash_flows]
-            
-            # Future value of positive flows
-            fv_positive = sum(cf * (1 + discount_rate) ** ((len(cash_flows) - month) / 12)
-                             for month, cf in enumerate(positive_flows, 1))
-            
-            # Present value of negative flows
-            pv_negative = initial_investment + sum(abs(cf) / (1 + discount_rate) ** (month / 12)
-                                                 for month, cf in enumerate(negative_flows, 1))
-            
-            if pv_negative == 0 or fv_positive <= 0:
-                return 0
-            
-            n_years = len(cash_flows) / 12
-            mirr = (fv_positive / pv_negative) ** (1 / n_years) - 1
-            
-            return mirr if -0.99 <= mirr <= 10 else 0
-            
+            return float(self._batch_mirr(initial_investment, np.atleast_2d(cash_flows), discount_rate)[0])
         except:
             return 0
     
+    def _batch_irr(self, initial_investment, cash_flows: np.ndarray,
+                   max_iterations: int = 100) -> np.ndarray:
+        """Annual IRR for every row of a (scenarios x months) cash flow matrix.
+        Runs Newton-Raphson from a 10% guess on all rows at once. Rows whose
+        NPV changes sign over [-99%, 1000%] keep a bracket and fall back to
+        bisection whenever a Newton step stalls or leaves it; a convergence
+        mask freezes finished rows. Rows without a root return 0, matching
+        the scalar solver's behaviour.
+        """
+        cash_flows = np.asarray(cash_flows, dtype=float)
+        rows, months = cash_flows.shape
+        initial = np.broadcast_to(np.asarray(initial_investment, dtype=float), (rows,))
+        years = np.arange(1, months + 1) / 12
+        
+        def npv_and_derivative(rate, flows, invest):
+            discount = (1 + rate[:, None]) ** -years
+            npv = -invest + np.sum(flows * discount, axis=1)
+            derivative = np.sum(-flows * years * discount, axis=1) / (1 + rate)
+            return npv, derivative
+        
+        lower = np.full(rows, -0.99)
+        upper = np.full(rows, 10.0)
+        npv_lower, _ = npv_and_derivative(lower, cash_flows, initial)
+        npv_upper, _ = npv_and_derivative(upper, cash_flows, initial)
+        bracketed = np.sign(npv_lower) * np.sign(npv_upper) < 0
+        
+        rate = np.full(rows, 0.1)  # Initial guess
+        converged = np.zeros(rows, dtype=bool)
+        failed = np.zeros(rows, dtype=bool)
+        
+        for _ in range(max_iterations):
+            active = np.flatnonzero(~converged & ~failed)
+            if active.size == 0:
+                break
+            
+            r = rate[active]
+            npv, derivative = npv_and_derivative(r, cash_flows[active], initial[active])
+            done = np.abs(npv) < 1e-6
+            
+            # Tighten the bracket around the root
+            in_bracket = bracketed[active]
+            same_side = np.sign(npv) == np.sign(npv_lower[active])
+            move_lower = in_bracket & same_side
+            move_upper = in_bracket & ~same_side
+            lower[active[move_lower]] = r[move_lower]
+            npv_lower[active[move_lower]] = npv[move_lower]
+            upper[active[move_upper]] = r[move_upper]
+            lo, hi = lower[active], upper[active]
+            done |= in_bracket & (hi - lo < 1e-12)
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                step = r - npv / derivative
+            stalled = ~np.isfinite(step) | (np.abs(derivative) < 1e-10)
+            
+            # Bisection fallback for bracketed rows, give up on the rest
+            bisect = in_bracket & (stalled | (step <= lo) | (step >= hi))
+            escaped = ~in_bracket & (stalled | (step < -0.99) | (step > 10))
+            next_rate = np.where(bisect, (lo + hi) / 2, step)
+            
+            converged[active[done]] = True
+            failed[active[~done & escaped]] = True
+            update = ~done & ~escaped
+            rate[active[update]] = next_rate[update]
+        
+        # Accept approximate roots the same way the scalar solver did
+        final_npv, _ = npv_and_derivative(rate, cash_flows, initial)
+        accepted = ~failed & (np.abs(final_npv) < 1000)
+        return np.where(accepted, rate, 0.0)
+    
+    def _batch_mirr(self, initial_investment, cash_flows: np.ndarray,
+                    discount_rate) -> np.ndarray:
+        """Annual MIRR for every row of a (scenarios x months) cash flow matrix"""
+        cash_flows = np.asarray(cash_flows, dtype=float)
+        rows, months = cash_flows.shape
+        if months == 0:
+            return np.zeros(rows)
+        
+        month_index = np.arange(1, months + 1)
+        
+        # Future value of positive flows
+        fv_factors = (1 + discount_rate) ** ((months - month_index) / 12)
+        fv_positive = np.maximum(cash_flows, 0) @ fv_factors
+        
+        # Present value of negative flows
+        pv_factors = (1 + discount_rate) ** (-month_index / 12)
+        pv_negative = initial_investment + np.abs(np.minimum(cash_flows, 0)) @ pv_factors
+        
+        valid = (pv_negative != 0) & (fv_positive > 0)
+        n_years = months / 12
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mirr = np.where(valid, (fv_positive / pv_negative) ** (1 / n_years) - 1, 0.0)
+        
+        return np.where((mirr >= -0.99) & (mirr <= 10), mirr, 0.0)
+    
     def _calculate_comprehensive_risk(self, country: CountryData, profile: UserProfile, 
                                     result: Dict) -> float:
         """Enhanced risk scoring with multiple factors"""
         try:
-            # Base country risks
-            political_risk = country.risk_factors.get('political', 0.1) * 25
-            economic_risk = country.risk_factors.get('economic', 0.1) * 35
-            regulatory_risk = country.risk_factors.get('regulatory', 0.1) * 25
-            
-            # Market sentiment risk
-            sentiment_risk = (1 - country.ai_sentiment) * 15
+            # Country, market sentiment and profile risks
+            static_risk = static_risk_score(
+                country.risk_factors.get('political', 0.1),
+                country.risk_factors.get('economic', 0.1),
+                country.risk_factors.get('regulatory', 0.1),
+                country.ai_sentiment,
+                profile.risk_tolerance
+            )
             
             # ROI volatility risk (from Monte Carlo if available)
             volatility_risk = 0
@@ -1384,9 +2746,6 @@ class AdvancedROICalculator:
                 std_roi = result['monte_carlo'].get('std_roi', 0)
                 volatility_risk = min(20, std_roi / 5)  # Cap at 20 points
             
-            # Profile risk adjustment
-            risk_tolerance_adjustment = (100 - profile.risk_tolerance) / 100 * 20
-            
             # Payback period risk
             payback_risk = 0
             if result['payback_years'] != float('inf'):
@@ -1399,9 +2758,7 @@ class AdvancedROICalculator:
             else:
                 payback_risk = 25
             
-            total_risk = (political_risk + economic_risk + regulatory_risk + 
-                         sentiment_risk + volatility_risk + risk_tolerance_adjustment + 
-                         payback_risk)
+            total_risk = static_risk + volatility_risk + payback_risk
             
             return min(100, max(0, total_risk))
             
@@ -1435,129 +2792,738 @@ class AdvancedROICalculator:
         except:
             return 50
     
-    def _generate_recommendation(self, result: Dict, risk_score: float, opportunity_score: float) -> str:
-        """Generate investment recommendation based on scores"""
-        roi = result.get('roi', 0)
-        
-        if roi >= 200 and risk_score < 30:
-            return "STRONG BUY - Exceptional opportunity with manageable risk"
-        elif roi >= 150 and risk_score < 40:
-            return "BUY - Strong opportunity with acceptable risk profile"
-        elif roi >= 100 and risk_score < 60:
-            return "HOLD/CONSIDER - Decent opportunity, monitor risk factors"
-        elif roi >= 50 and risk_score < 70:
-            return "WEAK HOLD - Marginal opportunity, consider alternatives"
-        else:
-            return "AVOID - Poor risk-adjusted returns, seek better opportunities"
+    def _generate_recommendation(self, result: Dict, risk_score: float, opportunity_score: float) -> str:
+        """Generate investment recommendation based on scores"""
+        roi = result.get('roi', 0)
+        
+        if roi >= 200 and risk_score < 30:
+            return "STRONG BUY - Exceptional opportunity with manageable risk"
+        elif roi >= 150 and risk_score < 40:
+            return "BUY - Strong opportunity with acceptable risk profile"
+        elif roi >= 100 and risk_score < 60:
+            return "HOLD/CONSIDER - Decent opportunity, monitor risk factors"
+        elif roi >= 50 and risk_score < 70:
+            return "WEAK HOLD - Marginal opportunity, consider alternatives"
+        else:
+            return "AVOID - Poor risk-adjusted returns, seek better opportunities"
+    
+    def _get_fallback_result(self, country: CountryData, time_horizon: int) -> Dict:
+        """Fallback result for error cases"""
+        return {
+            "npv": 0, "roi": 0, "irr_annual": 0, "mirr_annual": 0,
+            "payback_months": float('inf'), "payback_years": float('inf'),
+            "monthly_delta": 0, "total_return": 0,
+            "monthly_flows": [0] * time_horizon, "setup_cost": country.setup_cost,
+            "profitability_index": 1, "current_net_income": 0, "projected_net_income": 0
+        }
+
+# =========================
+# COLUMNAR COUNTRY DATA & SCORES
+# =========================
+
+RISK_FACTOR_TYPES = ("political", "economic", "regulatory")
+
+@dataclass(frozen=True, eq=False)
+class CountryTable:
+    """Struct-of-arrays view of a country database.
+    Row ``i`` of every array describes ``keys[i]``, so cross-country scoring
+    and filtering are single vectorized expressions.
+    Attributes:
+        keys: Country identifiers in row order.
+        row: Mapping of country identifier to row index.
+        names: Display names.
+        corp_tax: Corporate tax rates as decimals.
+        pers_tax: Personal tax rates as decimals.
+        living_cost: Monthly living costs.
+        business_cost: Monthly business costs.
+        setup_cost: One-time setup costs.
+        market_growth: Market growth percentages.
+        ease_score: Business ease scores (0-10).
+        banking_score: Banking quality scores (0-10).
+        partnership_score: Partnership scores.
+        ai_sentiment: Market sentiment scores.
+        seasonality: (countries x 12) monthly seasonality matrix.
+        risk_factors: (countries x 3) matrix ordered as ``RISK_FACTOR_TYPES``;
+            missing entries default to 0.1 like the risk model does.
+    """
+    
+    keys: Tuple[str, ...]
+    row: Dict[str, int]
+    names: Tuple[str, ...]
+    corp_tax: np.ndarray
+    pers_tax: np.ndarray
+    living_cost: np.ndarray
+    business_cost: np.ndarray
+    setup_cost: np.ndarray
+    market_growth: np.ndarray
+    ease_score: np.ndarray
+    banking_score: np.ndarray
+    partnership_score: np.ndarray
+    ai_sentiment: np.ndarray
+    seasonality: np.ndarray
+    risk_factors: np.ndarray
+    
+    @classmethod
+    def from_countries(cls, countries: Dict[str, CountryData]) -> 'CountryTable':
+        """Build the columnar view of ``countries`` with read-only arrays"""
+        values = list(countries.values())
+        
+        def column(attribute):
+            return np.array([getattr(country, attribute) for country in values], dtype=float)
+        
+        arrays = {
+            attribute: column(attribute)
+            for attribute in ("corp_tax", "pers_tax", "living_cost", "business_cost", "setup_cost",
+                              "market_growth", "ease_score", "banking_score", "partnership_score",
+                              "ai_sentiment")
+        }
+        arrays["seasonality"] = np.array([country.seasonality for country in values], dtype=float).reshape(-1, 12)
+        arrays["risk_factors"] = np.array(
+            [[country.risk_factors.get(risk, 0.1) for risk in RISK_FACTOR_TYPES] for country in values],
+            dtype=float
+        ).reshape(-1, len(RISK_FACTOR_TYPES))
+        
+        for array in arrays.values():
+            array.flags.writeable = False
+        
+        keys = tuple(countries.keys())
+        return cls(
+            keys=keys,
+            row={key: i for i, key in enumerate(keys)},
+            names=tuple(country.name for country in values),
+            **arrays
+        )
+    
+    def rows(self, country_keys) -> np.ndarray:
+        """Row indices of the known ``country_keys``, in the given order"""
+        return np.array([self.row[key] for key in country_keys if key in self.row], dtype=int)
+
+@lru_cache(maxsize=1)
+def get_country_table() -> CountryTable:
+    """Columnar view of ``ENHANCED_COUNTRIES``, cached until ``refresh_country_data``"""
+    return CountryTable.from_countries(ENHANCED_COUNTRIES)
+
+@dataclass(frozen=True, eq=False)
+class CountryScoreIndex:
+    """Precomputed (profile x country) scores shared by the chart builders.
+    Columns line up with the rows of ``table``. Every score is 0-100 and
+    depends only on static country/profile data. Risk uses the static part
+    of ``_calculate_comprehensive_risk`` (no Monte Carlo volatility, payback
+    within two years), which is what the charts have always plotted.
+    Attributes:
+        table: Columnar country data the scores were computed from.
+        profile_ids: Profile identifiers in row order of ``risk``.
+        tax_efficiency: Share of profit kept after corporate and personal tax.
+        cost_efficiency: Living cost score, higher is cheaper.
+        business_environment: Combined ease of business and banking score.
+        market_growth: Market growth score.
+        banking_quality: Banking system score.
+        risk: (profiles x countries) static risk scores.
+    """
+    
+    table: CountryTable
+    profile_ids: Tuple[str, ...]
+    tax_efficiency: np.ndarray
+    cost_efficiency: np.ndarray
+    business_environment: np.ndarray
+    market_growth: np.ndarray
+    banking_quality: np.ndarray
+    risk: np.ndarray
+    
+    def risk_for(self, profile_id: str) -> np.ndarray:
+        """Static risk of every country for one profile"""
+        return self.risk[self.profile_ids.index(profile_id)]
+    
+    def heatmap_matrix(self, country_keys, profile_id: str) -> np.ndarray:
+        """(countries x 6) heatmap scores; risk is inverted so higher is better"""
+        rows = self.table.rows(country_keys)
+        return np.column_stack([
+            self.tax_efficiency[rows], self.cost_efficiency[rows],
+            self.business_environment[rows], self.market_growth[rows],
+            self.banking_quality[rows], 100 - self.risk_for(profile_id)[rows]
+        ])
+
+@lru_cache(maxsize=1)
+def get_country_score_index() -> CountryScoreIndex:
+    """Build the score index on first use; cached until ``refresh_country_data``"""
+    table = get_country_table()
+    profiles = list(ENHANCED_PROFILES.values())
+    risk_tolerance = np.array([profile.risk_tolerance for profile in profiles], dtype=float)[:, None]
+    
+    # Payback within two years adds no payback risk; clip like the risk model
+    risk = np.clip(static_risk_score(
+        table.risk_factors[:, 0], table.risk_factors[:, 1], table.risk_factors[:, 2],
+        table.ai_sentiment, risk_tolerance
+    ), 0, 100)
+    
+    return CountryScoreIndex(
+        table=table,
+        profile_ids=tuple(profile.id for profile in profiles),
+        tax_efficiency=(1 - (table.corp_tax + table.pers_tax)) * 100,
+        cost_efficiency=np.maximum(0, 100 - table.living_cost / 150),
+        business_environment=(table.ease_score + table.banking_score) * 5,
+        market_growth=table.market_growth * 10,
+        banking_quality=table.banking_score * 10,
+        risk=risk
+    )
+
+# =========================
+# PARALLEL ANALYSIS EXECUTION
+# =========================
+
+def _comprehensive_roi_job(job: Tuple) -> Tuple[Optional[Dict], Optional[str]]:
+    """Worker entry point: one country's uncached comprehensive calculation.
+    Defined at module level so process pools can pickle it. Returns the
+    result and ``None``, or ``None`` and the error message.
+    """
+    calculator, profile, country, inputs, seed = job
+    try:
+        return calculator._compute_comprehensive_roi(profile, country, *inputs, seed=seed), None
+    except Exception as e:
+        return None, str(e)
+
+class AnalysisExecutor:
+    """Pluggable worker pool that fans out independent per-country jobs.
+    A process pool suits the CPU-bound calculation; if it cannot be
+    started or breaks (e.g. pickling or sandbox restrictions) the executor
+    falls back to a thread pool for good. Pools are created lazily and
+    reused across requests.
+    Attributes:
+        kind: ``"process"``, ``"thread"`` or ``"serial"``.
+        max_workers: Worker count; ``None`` uses the CPU count.
+    """
+    
+    def __init__(self, kind: str = "process", max_workers: Optional[int] = None):
+        """Configure the executor without starting any workers.
+        Args:
+            kind: Pool type to use for fan-out.
+            max_workers: Upper bound on concurrent workers.
+        Returns:
+            None
+        """
+        if kind not in ("process", "thread", "serial"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = None
+        self._lock = threading.Lock()
+    
+    def _get_pool(self):
+        """Create the underlying pool on first use"""
+        with self._lock:
+            if self._pool is None:
+                if self.kind == "process":
+                    try:
+                        self._pool = concurrent.futures.ProcessPoolExecutor(
+                            max_workers=self.max_workers,
+                            mp_context=multiprocessing.get_context("spawn")
+                        )
+                    except (OSError, NotImplementedError, ImportError) as e:
+                        print(f"Process pool unavailable, using threads: {e}")
+                        self.kind = "thread"
+                if self.kind == "thread":
+                    self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+    
+    def _fall_back_to_threads(self, error: Exception) -> None:
+        """Permanently switch a failing process pool to threads"""
+        print(f"Process pool failed, using threads: {error}")
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self.kind = "thread"
+    
+    def warm_up(self) -> None:
+        """Start the workers in the background so the first request skips their startup"""
+        if self.kind == "serial" or self.max_workers <= 1:
+            return
+        pool = self._get_pool()
+        try:
+            for _ in range(self.max_workers):
+                pool.submit(os.getpid)
+        except (concurrent.futures.BrokenExecutor, RuntimeError) as e:
+            if self.kind == "process":
+                self._fall_back_to_threads(e)
+    
+    def submit(self, fn, jobs: List) -> List[concurrent.futures.Future]:
+        """Submit ``fn(job)`` for every job and return the futures in order"""
+        if self.kind == "serial" or self.max_workers <= 1:
+            futures = []
+            for job in jobs:
+                future = concurrent.futures.Future()
+                try:
+                    future.set_result(fn(job))
+                except Exception as e:
+                    future.set_exception(e)
+                futures.append(future)
+            return futures
+        
+        pool = self._get_pool()
+        try:
+            return [pool.submit(fn, job) for job in jobs]
+        except (concurrent.futures.BrokenExecutor, pickle.PicklingError, RuntimeError) as e:
+            if self.kind != "process":
+                raise
+            self._fall_back_to_threads(e)
+            return self.submit(fn, jobs)
+    
+    def imap_completed(self, fn, jobs: List) -> Iterator[Tuple[int, object]]:
+        """Yield ``(index, fn(jobs[index]))`` pairs as each job finishes.
+        If the process pool breaks mid-flight, the jobs not yet yielded are
+        resubmitted to the thread pool fallback.
+        """
+        jobs = list(jobs)
+        remaining = set(range(len(jobs)))
+        
+        while remaining:
+            indices = sorted(remaining)
+            futures = dict(zip(self.submit(fn, [jobs[i] for i in indices]), indices))
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    index = futures[future]
+                    result = future.result()
+                    remaining.discard(index)
+                    yield index, result
+            except (concurrent.futures.BrokenExecutor, pickle.PicklingError) as e:
+                if self.kind != "process":
+                    raise
+                self._fall_back_to_threads(e)
+    
+    def imap_bounded(self, fn, jobs: Iterable, max_in_flight: Optional[int] = None) -> Iterator[object]:
+        """Yield ``fn(job)`` results in completion order with a bounded queue.
+        Jobs are drawn lazily and a new one is submitted as soon as any
+        in-flight job finishes, so at most ``max_in_flight`` jobs (default
+        two per worker) are queued and workers never wait for a whole
+        batch. If the process pool breaks, the in-flight jobs are
+        resubmitted to the thread pool fallback.
+        """
+        jobs = iter(jobs)
+        if self.kind == "serial" or self.max_workers <= 1:
+            for job in jobs:
+                yield fn(job)
+            return
+        
+        max_in_flight = max(1, max_in_flight or 2 * self.max_workers)
+        in_flight = {}
+        
+        def top_up(resubmit: List) -> None:
+            room = max_in_flight - len(in_flight) - len(resubmit)
+            batch = resubmit + [job for _, job in zip(range(room), jobs)]
+            in_flight.update(zip(self.submit(fn, batch), batch))
+        
+        top_up([])
+        while in_flight:
+            done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            try:
+                for future in done:
+                    result = future.result()
+                    del in_flight[future]
+                    yield result
+            except (concurrent.futures.BrokenExecutor, concurrent.futures.CancelledError,
+                    pickle.PicklingError) as e:
+                # Futures of a pool that already fell back are cancelled; just resubmit them
+                if self.kind == "process":
+                    self._fall_back_to_threads(e)
+                elif not isinstance(e, concurrent.futures.CancelledError):
+                    raise
+                lost = list(in_flight.values())
+                in_flight.clear()
+                top_up(lost)
+                continue
+            top_up([])
+    
+    def map(self, fn, jobs: List) -> List:
+        """Run ``fn`` over ``jobs`` on the pool and gather results in order"""
+        jobs = list(jobs)
+        if len(jobs) <= 1:
+            return [fn(job) for job in jobs]
+        
+        results = [None] * len(jobs)
+        for index, result in self.imap_completed(fn, jobs):
+            results[index] = result
+        return results
+    
+    def shutdown(self) -> None:
+        """Stop the worker pool; a later call starts a fresh one"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+            self._pool = None
+
+class DebounceGate:
+    """Generation counter that lets newer requests supersede older ones.
+    Each request takes a token from ``begin``; once a newer request has
+    begun, older tokens stop being current and their work is dropped.
+    ``settle`` adds the quiet period used to defer expensive refreshes
+    until input has stopped changing.
+    Attributes:
+        delay: Quiet period in seconds before deferred work starts.
+    """
+    
+    def __init__(self, delay: float = 1.2):
+        """Create a gate with no requests yet.
+        Args:
+            delay: Seconds a request must stay current before it settles.
+        Returns:
+            None
+        """
+        self.delay = delay
+        self._generation = 0
+        self._lock = threading.Lock()
+    
+    def begin(self) -> int:
+        """Start a request, superseding every earlier one"""
+        with self._lock:
+            self._generation += 1
+            return self._generation
+    
+    def is_current(self, token: int) -> bool:
+        """Whether no newer request has begun since ``token``"""
+        with self._lock:
+            return token == self._generation
+    
+    def settle(self, token: int) -> bool:
+        """Wait out the quiet period; ``True`` if ``token`` is still current"""
+        time.sleep(self.delay)
+        return self.is_current(token)
+
+class SessionDebounceGates:
+    """One ``DebounceGate`` per browser session.
+    A single app serves every session, so a shared gate would let one
+    user's slider release supersede another user's pending run. Gates are
+    created on first use and the least recently used sessions are
+    forgotten beyond ``max_sessions``.
+    Attributes:
+        delay: Quiet period of every gate in seconds.
+        max_sessions: Number of sessions whose gates are kept.
+    """
+    
+    def __init__(self, delay: float = 1.2, max_sessions: int = 1024):
+        """Create an empty registry.
+        Args:
+            delay: Quiet period passed to each ``DebounceGate``.
+            max_sessions: Number of sessions whose gates are kept.
+        Returns:
+            None
+        """
+        self.delay = delay
+        self.max_sessions = max_sessions
+        self._gates: "OrderedDict[str, DebounceGate]" = OrderedDict()
+        self._lock = threading.Lock()
     
-    def _get_fallback_result(self, country: CountryData, time_horizon: int) -> Dict:
-        """Fallback result for error cases"""
-        return {
-            "npv": 0, "roi": 0, "irr_annual": 0, "mirr_annual": 0,
-            "payback_months": float('inf'), "payback_years": float('inf'),
-            "monthly_delta": 0, "total_return": 0,
-            "monthly_flows": [0] * time_horizon, "setup_cost": country.setup_cost,
-            "profitability_index": 1, "current_net_income": 0, "projected_net_income": 0
-        }
+    def gate(self, session_id: Optional[str]) -> DebounceGate:
+        """The gate of ``session_id``, created on first use"""
+        key = session_id or ""
+        with self._lock:
+            gate = self._gates.pop(key, None) or DebounceGate(self.delay)
+            self._gates[key] = gate
+            while len(self._gates) > self.max_sessions:
+                self._gates.popitem(last=False)
+            return gate
 
 # =========================
 # ENHANCED VISUALIZATION ENGINE
 # =========================
 
+# plotly.js typed-array codes of the NumPy dtypes sent in binary form
+PLOTLY_TYPED_ARRAY_DTYPES = {
+    "int8": "i1", "uint8": "u1", "int16": "i2", "uint16": "u2",
+    "int32": "i4", "uint32": "u4", "float32": "f4", "float64": "f8"
+}
+
+def plotly_array(values):
+    """Encode an array for a Plotly JSON spec.
+    Numeric NumPy arrays become base64 typed arrays, exactly as Plotly
+    serializes them (64-bit integers are narrowed to the smallest type that
+    fits); anything else is sent as a plain list.
+    Args:
+        values: NumPy array or sequence of trace values.
+    Returns:
+        A plotly.js typed-array dict or a JSON-ready list.
+    """
+    if not isinstance(values, np.ndarray):
+        return list(values)
+    if values.dtype in (np.int64, np.uint64) and values.size:
+        narrower = (np.int8, np.int16, np.int32) if values.dtype == np.int64 else (np.uint8, np.uint16, np.uint32)
+        low, high = values.min(), values.max()
+        for dtype in narrower:
+            if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+                values = values.astype(dtype)
+                break
+    code = PLOTLY_TYPED_ARRAY_DTYPES.get(str(values.dtype))
+    if code is None or values.size == 0:
+        return values.tolist()
+    
+    spec = {"dtype": code, "bdata": base64.b64encode(np.ascontiguousarray(values)).decode("ascii")}
+    if values.ndim > 1:
+        spec["shape"] = str(values.shape)[1:-1]
+    return spec
+
+def plotly_trace(kind: str, fast: bool = False, **properties):
+    """Build a Plotly trace of type ``kind`` (``"scatter"``, ``"bar"``, ...).
+    Args:
+        kind: Plotly trace type.
+        fast: Return the trace as a raw JSON dict, skipping Plotly's
+            property validation, instead of a ``graph_objects`` trace.
+        **properties: Trace properties as accepted by ``graph_objects``;
+            with ``fast`` nested properties must use their full form
+            (e.g. ``marker=dict(color=...)``, not ``marker_color``), since
+            plotly.js does not expand Plotly's underscore shorthand.
+    Returns:
+        A validated ``graph_objects`` trace, or a JSON-ready dict.
+    """
+    if fast:
+        return dict(type=kind, **{
+            key: plotly_array(value) if isinstance(value, np.ndarray) else value
+            for key, value in properties.items()
+        })
+    import plotly.graph_objects as go
+    
+    return getattr(go, kind.capitalize())(**properties)
+
+@lru_cache(maxsize=4)
+def plotly_template(name: str = "plotly_white") -> Dict:
+    """Expanded JSON of a named Plotly template, for hand-built layouts"""
+    import plotly.io as pio
+    
+    return pio.templates[name].to_plotly_json()
+
+@dataclass
+class FigureSpec:
+    """Plotly figure held as its raw JSON spec.
+    Produced by the chart builders' ``fast`` path. It serializes straight to
+    JSON without constructing or validating ``graph_objects``, and Gradio's
+    ``Plot`` component accepts it like a ``go.Figure`` since it only calls
+    ``to_json``.
+    Attributes:
+        data: Trace dictionaries.
+        layout: Layout dictionary.
+    """
+    
+    data: List[Dict]
+    layout: Dict
+    
+    def to_dict(self) -> Dict:
+        """Figure as a ``{"data": ..., "layout": ...}`` dictionary"""
+        return {"data": self.data, "layout": self.layout}
+    
+    def to_json(self) -> str:
+        """Figure as a Plotly JSON string"""
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+    
+    def to_figure(self):
+        """Equivalent ``go.Figure``, e.g. for further editing or image export"""
+        import plotly.graph_objects as go
+        
+        return go.Figure(copy.deepcopy(self.to_dict()))
+
+# Default maximum number of points drawn per line trace
+CHART_POINT_BUDGET = 120
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """Indices of the points kept by Largest-Triangle-Three-Buckets.
+    The first and last points are always kept. The interior is split into
+    ``budget - 2`` buckets, and each bucket keeps the point forming the
+    largest triangle with the previously kept point and the mean of the
+    next bucket. This preserves the visual shape of a line far better than
+    striding.
+    Args:
+        x: Increasing x values.
+        y: y values, same length as ``x``.
+        budget: Number of points to keep.
+    Returns:
+        Sorted integer indices into ``x``/``y``; every index when the series
+        already fits the budget.
+    """
+    n = len(y)
+    if budget >= n or budget < 3:
+        return np.arange(n)
+    
+    edges = np.linspace(1, n - 1, budget - 1).astype(int)
+    selected = np.empty(budget, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    for bucket in range(budget - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket == budget - 3:
+            next_x, next_y = x[-1], y[-1]
+        else:
+            next_x = x[end:edges[bucket + 2]].mean()
+            next_y = y[end:edges[bucket + 2]].mean()
+        anchor = selected[bucket]
+        area = np.abs((x[anchor] - next_x) * (y[start:end] - y[anchor])
+                      - (x[anchor] - x[start:end]) * (next_y - y[anchor]))
+        selected[bucket + 1] = start + int(np.argmax(area))
+    return selected
+
+def downsample_line(x, y, budget: Optional[int] = CHART_POINT_BUDGET) -> Tuple[np.ndarray, np.ndarray]:
+    """Downsample a line trace to at most ``budget`` points, keeping zero crossings exact.
+    Slots are reserved first for the end points and for both points around
+    each sign change, earliest first, so the first crossing (e.g. the
+    payback month of a cumulative cash flow) always sits where it does in
+    the full series. Later crossings are kept while they fit, and the
+    remaining slots go to ``lttb_indices``.
+    Args:
+        x: Increasing x values.
+        y: y values, same length as ``x``.
+        budget: Maximum number of points, at least 4; ``None`` keeps every
+            point.
+    Returns:
+        Tuple of the kept x and y values as arrays.
+    Raises:
+        ValueError: If ``budget`` is below 4.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    if budget is not None and budget < 4:
+        raise ValueError("Point budget must be at least 4")
+    if budget is None or len(y) <= budget:
+        return x, y
+    
+    crossings = np.flatnonzero((y[1:] >= 0) != (y[:-1] >= 0))
+    reserved = {0, len(y) - 1}
+    for crossing in crossings:
+        pair = {int(crossing), int(crossing) + 1}
+        if len(reserved | pair) > budget:
+            break
+        reserved |= pair
+    
+    indices = np.array(sorted(reserved))
+    if budget - len(reserved) >= 3:
+        indices = np.union1d(lttb_indices(x, y, budget - len(reserved)), indices)
+    return x[indices], y[indices]
+
+# Axis pair of each (row, col) cell of the 3x2 dashboard grid
+DASHBOARD_AXES = {
+    (row, col): dict(xaxis=f"x{index if index > 1 else ''}", yaxis=f"y{index if index > 1 else ''}")
+    for index, (row, col) in enumerate(((r, c) for r in range(1, 4) for c in range(1, 3)), start=1)
+}
+
+@lru_cache(maxsize=1)
+def dashboard_layout_template() -> Dict:
+    """Validated layout of the comprehensive dashboard.
+    Subplot construction and layout validation are the bulk of the cost of
+    a dashboard, yet the grid, titles and break-even line never change.
+    They are built once here; every dashboard starts from a deep copy of
+    this dict and only adds its own traces and title.
+    Returns:
+        Plotly layout dictionary; callers must copy it before modifying.
+    """
+    from plotly.subplots import make_subplots
+    
+    fig = make_subplots(
+        rows=3, cols=2,
+        subplot_titles=(
+            "Cash Flow Projection", "Monte Carlo ROI Distribution", 
+            "Risk-Return Analysis", "Sensitivity Tornado",
+            "Scenario Comparison", "Confidence Intervals"
+        ),
+        specs=[
+            [{"type": "scatter"}, {"type": "bar"}],
+            [{"type": "scatter"}, {"type": "bar"}],
+            [{"type": "bar"}, {"type": "scatter"}]
+        ],
+        vertical_spacing=0.08,
+        horizontal_spacing=0.1
+    )
+    
+    # Breakeven line; the subplot has no traces yet, so keep it explicitly
+    fig.add_hline(y=0, line_dash="dash", line_color="red", row=1, col=1,
+                  exclude_empty_subplots=False)
+    
+    fig.update_layout(
+        height=1000,
+        showlegend=False,
+        template="plotly_white",
+        title_x=0.5,
+        title_font_size=20
+    )
+    return fig.layout.to_plotly_json()
+
+@lru_cache(maxsize=8)
+def dashboard_risk_return_trace(country_keys: Tuple[str, ...], profile_id: str, fast: bool = False):
+    """Risk-return scatter of ``country_keys``, shared by every dashboard.
+    The trace only depends on static country data, so it is cached per
+    country set until ``refresh_country_data``. With ``fast`` it is a raw
+    JSON dict (see ``plotly_trace``).
+    """
+    score_index = get_country_score_index()
+    rows = score_index.table.rows(country_keys)
+    return plotly_trace(
+        "scatter", fast,
+        x=score_index.table.market_growth[rows] * 20, y=score_index.risk_for(profile_id)[rows],
+        mode='markers+text', text=list(country_keys),
+        textposition="top center",
+        name='Countries Risk-Return',
+        marker=dict(size=12, color='#f59e0b', opacity=0.8),
+        **DASHBOARD_AXES[2, 1]
+    )
+
 class AdvancedChartGenerator:
     """Generates Plotly charts summarizing ROI analyses and comparisons."""
     
     @staticmethod
-    def create_comprehensive_dashboard(result: Dict, country_name: str, profile_name: str) -> go.Figure:
+    def create_comprehensive_dashboard(result: Dict, country_name: str, profile_name: str,
+                                       fast: bool = False,
+                                       max_points: Optional[int] = CHART_POINT_BUDGET):
         """Create an interactive dashboard visualizing ROI analysis.
         Args:
             result: Output dictionary from the ROI calculator.
             country_name: Name of the country being evaluated.
             profile_name: Name of the user's profile.
+            fast: Emit the figure as a raw JSON ``FigureSpec`` instead of
+                validated Plotly objects; the chart looks the same.
+            max_points: Point budget of the cash flow line; longer horizons
+                are downsampled (see ``downsample_line``), ``None`` draws
+                every month.
         Returns:
-            A Plotly ``Figure`` object containing multiple subplots with cash
-            flow, risk and scenario information.
-        Side Effects:
-            Uses random sampling to mock Monte Carlo distributions when
-            provided with summary statistics.
+            A Plotly ``Figure`` (or ``FigureSpec`` with ``fast``) containing
+            multiple subplots with cash flow, risk and scenario information.
         """
+        import plotly.graph_objects as go
+        
         try:
-            fig = make_subplots(
-                rows=3, cols=2,
-                subplot_titles=(
-                    "Cash Flow Projection", "Monte Carlo ROI Distribution", 
-                    "Risk-Return Analysis", "Sensitivity Tornado",
-                    "Scenario Comparison", "Confidence Intervals"
-                ),
-                specs=[
-                    [{"type": "scatter"}, {"type": "histogram"}],
-                    [{"type": "scatter"}, {"type": "bar"}],
-                    [{"type": "bar"}, {"type": "scatter"}]
-                ],
-                vertical_spacing=0.08,
-                horizontal_spacing=0.1
-            )
+            traces = []
             
             # 1. Enhanced Cash Flow Projection
             monthly_flows = result.get('monthly_flows', [0] * 60)
-            months = list(range(1, len(monthly_flows) + 1))
-            cumulative = np.cumsum([-result.get('setup_cost', 50000)] + monthly_flows)
+            # Month 0 is the setup cost, so payback lands on its own month
+            cumulative = np.cumsum([-result.get('setup_cost', 50000)] + list(monthly_flows))
+            months, cumulative = downsample_line(np.arange(len(cumulative)), cumulative, max_points)
             
-            fig.add_trace(
-                go.Scatter(
+            traces.append(
+                plotly_trace(
+                    "scatter", fast,
                     x=months, y=cumulative, mode='lines+markers',
                     name='Cumulative Cash Flow',
                     line=dict(color='#2563eb', width=3),
-                    fill='tonexty' if any(c >= 0 for c in cumulative) else None
-                ), row=1, col=1
+                    fill='tonexty' if any(c >= 0 for c in cumulative) else None,
+                    **DASHBOARD_AXES[1, 1]
+                )
             )
             
-            # Add breakeven line
-            fig.add_hline(y=0, line_dash="dash", line_color="red", row=1, col=1)
-            
             # 2. Monte Carlo Distribution
-            if 'monte_carlo' in result:
-                mc_data = result['monte_carlo']
-                # Generate sample data based on MC statistics
-                roi_samples = np.random.normal(
-                    mc_data.get('mean_roi', 0),
-                    max(1, mc_data.get('std_roi', 10)),
-                    1000
-                )
+            histogram = result.get('monte_carlo', {}).get('roi_histogram')
+            if histogram:
+                # Plot the simulation's own bins rather than resampling
+                bin_edges = np.asarray(histogram['bin_edges'])
                 
-                fig.add_trace(
-                    go.Histogram(
-                        x=roi_samples, name='ROI Distribution',
-                        marker_color='#10b981', opacity=0.7,
-                        nbinsx=30
-                    ), row=1, col=2
+                traces.append(
+                    plotly_trace(
+                        "bar", fast,
+                        x=(bin_edges[:-1] + bin_edges[1:]) / 2,
+                        y=histogram['counts'],
+                        width=np.diff(bin_edges),
+                        name='ROI Distribution',
+                        marker=dict(color='#10b981'), opacity=0.7,
+                        **DASHBOARD_AXES[1, 2]
+                    )
                 )
             
             # 3. Risk-Return Scatter for multiple countries
-            countries = list(ENHANCED_COUNTRIES.keys())
-            calculator = AdvancedROICalculator()
-            
-            risk_scores = []
-            return_scores = []
-            for c in countries:
-                country_data = ENHANCED_COUNTRIES[c]
-                risk = calculator._calculate_comprehensive_risk(
-                    country_data, 
-                    ENHANCED_PROFILES.get('tech_startup', list(ENHANCED_PROFILES.values())[0]),
-                    {'roi': country_data.market_growth * 20, 'payback_years': 2}
-                )
-                risk_scores.append(risk)
-                return_scores.append(country_data.market_growth * 20)
-            
-            fig.add_trace(
-                go.Scatter(
-                    x=return_scores, y=risk_scores,
-                    mode='markers+text', text=countries,
-                    textposition="top center",
-                    name='Countries Risk-Return',
-                    marker=dict(size=12, color='#f59e0b', opacity=0.8)
-                ), row=2, col=1
-            )
+            reference_profile = 'tech_startup' if 'tech_startup' in ENHANCED_PROFILES else next(iter(ENHANCED_PROFILES))
+            traces.append(dashboard_risk_return_trace(get_country_table().keys, reference_profile, fast))
             
             # 4. Sensitivity Tornado Chart
             if 'sensitivity' in result:
@@ -1574,12 +3540,14 @@ class AdvancedChartGenerator:
                                 impacts.append(impact)
                     
                     if variables:
-                        fig.add_trace(
-                            go.Bar(
+                        traces.append(
+                            plotly_trace(
+                                "bar", fast,
                                 y=variables, x=impacts, orientation='h',
                                 name='Sensitivity Impact',
-                                marker_color='#8b5cf6'
-                            ), row=2, col=2
+                                marker=dict(color='#8b5cf6'),
+                                **DASHBOARD_AXES[2, 2]
+                            )
                         )
             
             # 5. Scenario Comparison
@@ -1589,12 +3557,14 @@ class AdvancedChartGenerator:
                 scenario_rois = [scenarios[s].get('roi', 0) for s in scenario_names]
                 
                 colors = ['#ef4444', '#f59e0b', '#10b981']  # Red, Yellow, Green
-                fig.add_trace(
-                    go.Bar(
+                traces.append(
+                    plotly_trace(
+                        "bar", fast,
                         x=scenario_names, y=scenario_rois,
                         name='Scenario ROI',
-                        marker_color=colors[:len(scenario_names)]
-                    ), row=3, col=1
+                        marker=dict(color=colors[:len(scenario_names)]),
+                        **DASHBOARD_AXES[3, 1]
+                    )
                 )
             
             # 6. Confidence Intervals
@@ -1604,24 +3574,25 @@ class AdvancedChartGenerator:
                 ci_values = [ci_data[f'roi_{level}'] for level in ci_levels]
                 
                 if ci_levels and ci_values:
-                    fig.add_trace(
-                        go.Scatter(
+                    traces.append(
+                        plotly_trace(
+                            "scatter", fast,
                             x=ci_levels, y=ci_values,
                             mode='lines+markers',
                             name='ROI Confidence Intervals',
-                            line=dict(color='#06b6d4', width=3)
-                        ), row=3, col=2
+                            line=dict(color='#06b6d4', width=3),
+                            **DASHBOARD_AXES[3, 2]
+                        )
                     )
             
-            # Update layout
-            fig.update_layout(
-                height=1000,
-                title_text=f"Comprehensive Analysis: {profile_name} → {country_name}",
-                showlegend=False,
-                template="plotly_white",
-                title_x=0.5,
-                title_font_size=20
-            )
+            # Traces were validated on construction and the layout template
+            # once, so the figure itself skips validation
+            layout = copy.deepcopy(dashboard_layout_template())
+            layout['title']['text'] = f"Comprehensive Analysis: {profile_name} → {country_name}"
+            if fast:
+                return FigureSpec(data=traces, layout=layout)
+            fig = go.Figure(layout=layout, _validate=False)
+            fig.add_traces(traces)
             
             return fig
             
@@ -1639,20 +3610,24 @@ class AdvancedChartGenerator:
             return fig
     
     @staticmethod
-    def create_country_heatmap(selected_countries: List[str], profile_id: str) -> go.Figure:
-        ""Create a comparative heatmap for selected countries.
+    def create_country_heatmap(selected_countries: List[str], profile_id: str, fast: bool = False):
+        """Create a comparative heatmap for selected countries.
 
         Args:
             selected_countries: List of country identifiers to display.
             profile_id: Profile identifier used to tailor scoring.
+            fast: Emit the figure as a raw JSON ``FigureSpec`` instead of
+                validated Plotly objects; the chart looks the same.
 
         Returns:
-            A Plotly ``Figure`` heatmap comparing multiple metrics across the
-            chosen countries.
+            A Plotly ``Figure`` (or ``FigureSpec`` with ``fast``) heatmap
+            comparing multiple metrics across the chosen countries.
 
         Side Effects:
             Prints an error message if heatmap generation fails.
         """
+        import plotly.graph_objects as go
+        
         try:
             if not selected_countries or profile_id not in ENHANCED_PROFILES:
                 return go.Figure()
@@ -1665,69 +3640,123 @@ class AdvancedChartGenerator:
                 'Market Growth', 'Banking Quality', 'Risk Score'
             ]
             
-            heatmap_data = []
-            countries_data = []
-            
-            for country_key in selected_countries[:8]:  # Limit to 8 countries
-                if country_key in ENHANCED_COUNTRIES:
-                    country = ENHANCED_COUNTRIES[country_key]
-                    
-                    # Calculate normalized scores (0-100)
-                    tax_eff = (1 - (country.corp_tax + country.pers_tax)) * 100
-                    cost_eff = max(0, 100 - (country.living_cost / 150))  # Normalized
-                    business_env = (country.ease_score + country.banking_score) * 5
-                    market_growth = country.market_growth * 10
-                    banking = country.banking_score * 10
-                    
-                    # Risk score (inverted so higher is better)
-                    calculator = AdvancedROICalculator()
-                    risk_raw = calculator._calculate_comprehensive_risk(country, profile, {'roi': 100, 'payback_years': 2})
-                    risk_score = 100 - risk_raw
-                    
-                    country_scores = [tax_eff, cost_eff, business_env, market_growth, banking, risk_score]
-                    heatmap_data.append(country_scores)
-                    countries_data.append(country.name)
-            
-            if not heatmap_data:
+            # Normalized scores (0-100) for up to 8 countries in one pass
+            score_index = get_country_score_index()
+            country_keys = [c for c in selected_countries if c in score_index.table.row][:8]
+            if not country_keys:
                 return go.Figure()
             
-            fig = go.Figure(data=go.Heatmap(
-                z=heatmap_data,
+            heatmap_data = score_index.heatmap_matrix(country_keys, profile_id)
+            countries_data = [ENHANCED_COUNTRIES[c].name for c in country_keys]
+            
+            heatmap = plotly_trace(
+                "heatmap", fast,
+                z=heatmap_data if fast else heatmap_data.tolist(),
                 x=metrics,
                 y=countries_data,
                 colorscale='RdYlGn',
                 text=[[f'{val:.1f}' for val in row] for row in heatmap_data],
                 texttemplate="%{text}",
                 textfont={"size": 12},
-                colorbar=dict(title="Score (0-100)")
-            ))
+                colorbar=dict(title=dict(text="Score (0-100)"))
+            )
+            layout = dict(
+                title=dict(text=f"Country Comparison Heatmap - {profile.name}"),
+                xaxis=dict(title=dict(text="Evaluation Criteria")),
+                yaxis=dict(title=dict(text="Countries")),
+                height=400 + len(countries_data) * 30
+            )
+            
+            if fast:
+                # Plotly.js only understands expanded templates
+                return FigureSpec(data=[heatmap], layout=dict(layout, template=plotly_template("plotly_white")))
+            fig = go.Figure(data=heatmap)
+            fig.update_layout(template="plotly_white", **layout)
+            
+            return fig
+            
+        except Exception as e:
+            print(f"Heatmap generation error: {e}")
+            fig = go.Figure()
+            fig.add_annotation(text=f"Heatmap error: {str(e)}", x=0.5, y=0.5)
+            return fig
+    
+    @staticmethod
+    def create_sensitivity_surface(surface: Dict, country_name: str = "",
+                                   kind: str = "contour") -> "go.Figure":
+        """Create a contour or heatmap of a two-input sensitivity surface.
+
+        Args:
+            surface: Output of ``AdvancedROICalculator.calculate_sensitivity_surface``.
+            country_name: Country shown in the chart title.
+            kind: ``"contour"`` (with a highlighted break-even line for ROI
+                and NPV) or ``"heatmap"``.
+
+        Returns:
+            A Plotly ``Figure`` of the metric over both inputs.
+
+        Side Effects:
+            Prints an error message if chart generation fails.
+        """
+        import plotly.graph_objects as go
+        
+        try:
+            metric = surface['metric']
+            metric_label = metric.replace('_', ' ').upper() if metric in ('roi', 'npv') \
+                else metric.replace('_', ' ').title()
+            x_label = surface['x_variable'].replace('_', ' ').title()
+            y_label = surface['y_variable'].replace('_', ' ').title()
+            common = dict(
+                x=surface['x_values'], y=surface['y_values'], z=surface['values'],
+                colorscale='RdYlGn', zmid=0 if metric in ('roi', 'npv') else None,
+                colorbar=dict(title=metric_label),
+                hovertemplate=f"{x_label}: %{{x:.3g}}<br>{y_label}: %{{y:.3g}}"
+                              f"<br>{metric_label}: %{{z:,.1f}}<extra></extra>"
+            )
+            
+            if kind == "heatmap":
+                fig = go.Figure(data=go.Heatmap(**common))
+            else:
+                fig = go.Figure(data=go.Contour(**common, contours=dict(showlabels=True)))
+                if metric in ('roi', 'npv'):
+                    # Break-even boundary
+                    fig.add_trace(go.Contour(
+                        x=surface['x_values'], y=surface['y_values'], z=surface['values'],
+                        contours=dict(start=0, end=0, size=1, coloring='none'),
+                        line=dict(color='#0f172a', width=3, dash='dash'),
+                        showscale=False, hoverinfo='skip', name='Break-even'
+                    ))
             
             fig.update_layout(
-                title=f"Country Comparison Heatmap - {profile.name}",
-                xaxis_title="Evaluation Criteria",
-                yaxis_title="Countries",
-                height=400 + len(countries_data) * 30,
+                title=f"{metric_label} Sensitivity: {x_label} × {y_label}"
+                      + (f" - {country_name}" if country_name else ""),
+                xaxis_title=x_label,
+                yaxis_title=y_label,
+                height=550,
                 template="plotly_white"
             )
             
             return fig
             
         except Exception as e:
-            print(f"Heatmap generation error: {e}")
+            print(f"Sensitivity surface error: {e}")
             fig = go.Figure()
-            fig.add_annotation(text=f"Heatmap error: {str(e)}", x=0.5, y=0.5)
+            fig.add_annotation(text=f"Sensitivity surface error: {str(e)}", x=0.5, y=0.5)
             return fig
 # =========================
 # LEAD GENERATION & CRM SYSTEM
 # =========================
 class EnhancedLeadEngine:
-"""Creates personalized offers and manages lead-generation logic."""
-    def __init__(self):
+    """Creates personalized offers and manages lead-generation logic."""
+    def __init__(self, seed: Optional[int] = None):
         """Initialize conversion funnel thresholds and pricing tiers.
 
+        Args:
+            seed: Root seed making offer bonuses and social proof reproducible.
         Returns:
             None
         """
+        self.seed = seed
         self.conversion_funnel = {
             'email_capture': {'roi_min': 30, 'confidence': 0.2},
             'consultation_booking': {'roi_min': 100, 'confidence': 0.5},
@@ -1761,6 +3790,7 @@ class EnhancedLeadEngine:
             Logs an error message if offer generation fails.
         """
         try:
+            rng = make_rng(self.seed, "offer", profile.id, country.name)
             roi = result.get('roi', 0)
             confidence = result.get('monte_carlo', {}).get('probability_positive_roi', 0)
             risk_score = result.get('risk_score', 50)
@@ -1795,8 +3825,8 @@ class EnhancedLeadEngine:
                 'includes': self._generate_offer_includes(offer_tier, country, profile),
                 'cta': self._generate_cta_text(offer_tier),
                 'guarantee': self._generate_guarantee(offer_tier),
-                'bonuses': self._generate_bonuses(offer_tier, roi),
-                'social_proof': self._generate_social_proof(country, profile),
+                'bonuses': self._generate_bonuses(offer_tier, roi, rng),
+                'social_proof': self._generate_social_proof(country, profile, rng),
                 'timeline': self._estimate_delivery_timeline(offer_tier),
                 'payment_options': self._generate_payment_options(discounted_price, offer_tier)
             }
@@ -1945,7 +3975,7 @@ class EnhancedLeadEngine:
         }
         return guarantees.get(tier, "Satisfaction guaranteed")
     
-    def _generate_bonuses(self, tier: str, roi: float) -> List[str]:
+    def _generate_bonuses(self, tier: str, roi: float, rng: np.random.Generator) -> List[str]:
         """Generate compelling bonuses"""
         base_bonuses = {
             'starter': ["Digital nomad tax guide", "Country comparison calculator"],
@@ -1958,18 +3988,20 @@ class EnhancedLeadEngine:
         
         # ROI-based bonus additions
         if roi >= 200:
-            bonuses.insert(0, f"🎁 BONUS: ROI Optimization Masterclass (${random.randint(497, 997)} value)")
+            bonuses.insert(0, f"🎁 BONUS: ROI Optimization Masterclass (${rng.integers(497, 998)} value)")
         
         return bonuses
     
-    def _generate_social_proof(self, country: CountryData, profile: UserProfile) -> str:
+    def _generate_social_proof(self, country: CountryData, profile: UserProfile,
+                               rng: np.random.Generator) -> str:
         """Generate relevant social proof"""
+        outlets = ['Forbes', 'Entrepreneur', 'Inc Magazine', 'Business Insider']
         proofs = [
-            f"Join 2,{random.randint(100, 900)}+ entrepreneurs who've successfully relocated to {country.name}",
-            f"★★★★★ Rated 4.{random.randint(7, 9)}/5 by {random.randint(500, 1500)} clients", 
-            f"Featured in {random.choice(['Forbes', 'Entrepreneur', 'Inc Magazine', 'Business Insider'])}"
+            f"Join 2,{rng.integers(100, 901)}+ entrepreneurs who've successfully relocated to {country.name}",
+            f"★★★★★ Rated 4.{rng.integers(7, 10)}/5 by {rng.integers(500, 1501)} clients", 
+            f"Featured in {outlets[rng.integers(len(outlets))]}"
         ]
-        return random.choice(proofs)
+        return proofs[rng.integers(len(proofs))]
     
     def _estimate_delivery_timeline(self, tier: str) -> str:
         """Estimate delivery timeline"""
@@ -2018,10 +4050,26 @@ class EnhancedLeadEngine:
 # =========================
 # MAIN APPLICATION - ENHANCED
 # =========================
-def create_premium_immigration_app():
-    """Create the revolutionary VisaTier 5.0 application"""
+def create_premium_immigration_app(executor_kind: str = "process", max_workers: Optional[int] = None,
+                                   seed: Optional[int] = None, fast_charts: bool = False,
+                                   max_chart_points: Optional[int] = CHART_POINT_BUDGET):
+    """Create the revolutionary VisaTier 5.0 application.
+    Args:
+        executor_kind: Worker pool used for per-country analysis
+            (``"process"``, ``"thread"`` or ``"serial"``).
+        max_workers: Number of analysis workers; ``None`` uses the CPU count.
+        seed: Root seed shared by every engine; identical inputs then give
+            identical outputs. ``None`` keeps the app unseeded.
+        fast_charts: Send charts as raw Plotly JSON specs, skipping Plotly's
+            object validation (see ``AdvancedChartGenerator``).
+        max_chart_points: Point budget of the dashboard's cash flow line;
+            ``None`` draws every month.
+    Returns:
+        The configured Gradio ``Blocks`` application.
+    """
+    import gradio as gr  # The UI stack is only loaded when serving
     
-    with gr.Blocks(theme=PREMIUM_THEME, css=PREMIUM_CSS, title="VisaTier 5.0") as app:
+    with gr.Blocks(theme=build_premium_theme(), css=PREMIUM_CSS, title="VisaTier 5.0") as app:
         
         # State management
         current_profile = gr.State("tech_startup")
@@ -2236,6 +4284,12 @@ def create_premium_immigration_app():
                     elem_classes=["premium-button"]
                 )
                 
+                live_mode = gr.Checkbox(
+                    value=False,
+                    label="⚡ Live What-If Mode",
+                    info="Update KPIs as you release a slider; full analysis follows once you pause"
+                )
+                
                 # Real-time confidence meter
                 gr.HTML("""
                 <div class="confidence-meter">
@@ -2286,10 +4340,13 @@ def create_premium_immigration_app():
         results_section = gr.HTML(visible=False)
         
         # Hidden calculator instances
-        calculator = AdvancedROICalculator()
-        ai_engine = AIInsightEngine()
-        lead_engine = EnhancedLeadEngine()
+        calculator = AdvancedROICalculator(seed=seed)
+        ai_engine = AIInsightEngine(seed=seed)
+        lead_engine = EnhancedLeadEngine(seed=seed)
         chart_generator = AdvancedChartGenerator()
+        analysis_executor = AnalysisExecutor(kind=executor_kind, max_workers=max_workers)
+        analysis_executor.warm_up()
+        live_gates = SessionDebounceGates()
         
         def update_profile(profile_id):
             """Update current profile and return profile info"""
@@ -2337,8 +4394,10 @@ def create_premium_immigration_app():
             
             # Add summary stats
             if len(selected_countries) > 1:
-                avg_corp_tax = sum(ENHANCED_COUNTRIES[c].corp_tax for c in selected_countries if c in ENHANCED_COUNTRIES) / len(selected_countries)
-                avg_living = sum(ENHANCED_COUNTRIES[c].living_cost for c in selected_countries if c in ENHANCED_COUNTRIES) / len(selected_countries)
+                table = get_country_table()
+                rows = table.rows(selected_countries)
+                avg_corp_tax = table.corp_tax[rows].sum() / len(selected_countries)
+                avg_living = table.living_cost[rows].sum() / len(selected_countries)
                 
                 preview_html += f"""
                 <div class="preview-summary">
@@ -2354,7 +4413,11 @@ def create_premium_immigration_app():
             return preview_html
         
         def run_comprehensive_analysis(*args):
-            """Main analysis function with all enhancements"""
+            """Main analysis function with all enhancements.
+            Streams partial updates: KPI cards, insights and per-country
+            rows refresh as each country's result lands, then the heatmap,
+            and the expensive dashboard figure and CTA come last.
+            """
             try:
                 # Extract parameters
                 (profile_id, selected_countries, current_rev, current_mar, current_corp, 
@@ -2362,32 +4425,55 @@ def create_premium_immigration_app():
                  success_prob, time_hor, disc_rate) = args
                 
                 if not selected_countries or profile_id not in ENHANCED_PROFILES:
-                    return [gr.update()] * 6
+                    yield [gr.update()] * 6
+                    return
                 
                 profile = ENHANCED_PROFILES[profile_id]
                 results = {}
                 ai_insights_all = {}
                 
-                # Calculate for each country
-                for country_key in selected_countries:
-                    if country_key in ENHANCED_COUNTRIES:
-                        country = ENHANCED_COUNTRIES[country_key]
-                        
-                        # Run comprehensive calculation
-                        result = calculator.calculate_comprehensive_roi(
-                            profile, country, current_rev, current_mar,
-                            current_corp, current_pers, current_liv, current_bus,
-                            rev_mult, mar_imp, success_prob, time_hor, disc_rate
-                        )
-                        
-                        results[country_key] = result
-                        
-                        # Generate AI insights
-                        insight = ai_engine.generate_personalized_insight(profile, country, result)
-                        ai_insights_all[country_key] = insight
+                # Run the comprehensive calculation for all countries in parallel
+                countries = {
+                    country_key: ENHANCED_COUNTRIES[country_key]
+                    for country_key in selected_countries
+                    if country_key in ENHANCED_COUNTRIES
+                }
+                completed = calculator.iter_many(
+                    profile, countries, current_rev, current_mar,
+                    current_corp, current_pers, current_liv, current_bus,
+                    rev_mult, mar_imp, success_prob, time_hor, disc_rate,
+                    executor=analysis_executor
+                )
+                
+                for country_key, result in completed:
+                    results[country_key] = result
+                    
+                    # Generate AI insights
+                    insight = ai_engine.generate_personalized_insight(profile, countries[country_key], result)
+                    ai_insights_all[country_key] = insight
+                    
+                    # Stream what is known so far
+                    yield [
+                        gr.update(),
+                        gr.update(),
+                        gr.update(value=generate_ai_insights_display(ai_insights_all, profile), visible=True),
+                        gr.update(value=generate_kpi_cards(results, profile), visible=True),
+                        gr.update(value=generate_detailed_analysis(results, profile, ai_insights_all), visible=True),
+                        gr.update()
+                    ]
                 
                 if not results:
-                    return [gr.update()] * 6
+                    yield [gr.update()] * 6
+                    return
+                
+                # Results streamed in completion order; lay them out in selection order
+                results = {key: results[key] for key in countries if key in results}
+                ai_insights_all = {key: ai_insights_all[key] for key in results}
+                
+                # Create country heatmap
+                heatmap = chart_generator.create_country_heatmap(selected_countries, profile_id,
+                                                                 fast=fast_charts)
+                yield [gr.update(value=heatmap, visible=True)] + [gr.update()] * 5
                 
                 # Generate visualizations
                 best_country = max(results.keys(), key=lambda k: results[k]['roi'])
@@ -2396,30 +4482,19 @@ def create_premium_immigration_app():
                 
                 # Create comprehensive dashboard
                 dashboard = chart_generator.create_comprehensive_dashboard(
-                    best_result, best_country_data.name, profile.name
+                    best_result, best_country_data.name, profile.name, fast=fast_charts,
+                    max_points=max_chart_points
                 )
                 
-                # Create country heatmap
-                heatmap = chart_generator.create_country_heatmap(selected_countries, profile_id)
-                
-                # Generate AI insights display
-                ai_display = generate_ai_insights_display(ai_insights_all, profile)
-                
-                # Generate KPI cards
-                kpi_display = generate_kpi_cards(results, profile)
-                
-                # Generate detailed analysis
-                detailed_display = generate_detailed_analysis(results, profile, ai_insights_all)
-                
                 # Generate final CTA section with dynamic offers
                 cta_display = generate_cta_section(results, profile, ai_insights_all, lead_engine)
                 
-                return [
-                    gr.update(value=heatmap, visible=True),
-                    gr.update(value=dashboard, visible=True), 
-                    gr.update(value=ai_display, visible=True),
-                    gr.update(value=kpi_display, visible=True),
-                    gr.update(value=detailed_display, visible=True),
+                yield [
+                    gr.update(),
+                    gr.update(value=dashboard, visible=True),
+                    gr.update(value=generate_ai_insights_display(ai_insights_all, profile), visible=True),
+                    gr.update(value=generate_kpi_cards(results, profile), visible=True),
+                    gr.update(value=generate_detailed_analysis(results, profile, ai_insights_all), visible=True),
                     gr.update(value=cta_display, visible=True)
                 ]
                 
@@ -2432,7 +4507,48 @@ def create_premium_immigration_app():
                     <p><small>Error: {str(e)[:100]}</small></p>
                 </div>
                 """
-                return [gr.update(value=error_html, visible=True)] + [gr.update()] * 5
+                yield [gr.update(value=error_html, visible=True)] + [gr.update()] * 5
+        
+        def run_live_preview(live, *args):
+            """Recompute base metrics and KPI cards for a live what-if update"""
+            try:
+                (profile_id, selected_countries, *inputs) = args
+                if not live or not selected_countries or profile_id not in ENHANCED_PROFILES:
+                    return gr.update()
+                
+                profile = ENHANCED_PROFILES[profile_id]
+                results = {
+                    country_key: calculator.calculate_quick_metrics(
+                        profile, ENHANCED_COUNTRIES[country_key], *inputs
+                    )
+                    for country_key in selected_countries
+                    if country_key in ENHANCED_COUNTRIES
+                }
+                if not results:
+                    return gr.update()
+                return gr.update(value=generate_kpi_cards(results, profile), visible=True)
+                
+            except Exception as e:
+                print(f"Live preview error: {e}")
+                return gr.update()
+        
+        def run_deferred_analysis(request: gr.Request, live, *args):
+            """Full analysis once the sliders have been idle for a moment.
+            Every slider release supersedes the previous deferred run of the
+            same browser session, so only the last one in a burst of changes
+            reaches the expensive Monte Carlo refresh; a run that is
+            overtaken mid-stream stops.
+            """
+            live_gate = live_gates.gate(getattr(request, "session_hash", None))
+            token = live_gate.begin()
+            if not live or not live_gate.settle(token):
+                yield [gr.update()] * 6
+                return
+            
+            for update in run_comprehensive_analysis(*args):
+                if not live_gate.is_current(token):
+                    return
+                yield update
         
         def generate_ai_insights_display(insights_all, profile):
             """Generate comprehensive AI insights display"""
@@ -2561,20 +4677,25 @@ def create_premium_immigration_app():
             </div>
             """
             
-            # Success Probability
+            # Success Probability; live previews have no simulation yet
             if 'monte_carlo' in best_result:
                 success_prob = best_result['monte_carlo']['probability_positive_roi'] * 100
+                prob_class = "success" if success_prob > 80 else "warning" if success_prob > 60 else "error"
+                html += f"""
+                <div class="kpi-card {prob_class}">
+                    <div class="kpi-label">Success Probability</div>
+                    <div class="kpi-value">{success_prob:.0f}%</div>
+                    <div class="kpi-note">Monte Carlo simulation</div>
+                </div>
+                """
             else:
-                success_prob = 70
-            
-            prob_class = "success" if success_prob > 80 else "warning" if success_prob > 60 else "error"
-            html += f"""
-            <div class="kpi-card {prob_class}">
-                <div class="kpi-label">Success Probability</div>
-                <div class="kpi-value">{success_prob:.0f}%</div>
-                <div class="kpi-note">Monte Carlo simulation</div>
-            </div>
-            """
+                html += """
+                <div class="kpi-card pending">
+                    <div class="kpi-label">Success Probability</div>
+                    <div class="kpi-value">…</div>
+                    <div class="kpi-note">Monte Carlo simulation pending</div>
+                </div>
+                """
             
             html += '</div></div>'
             return html
@@ -2790,18 +4911,51 @@ def create_premium_immigration_app():
             outputs=[country_preview]
         )
         
+        analysis_inputs = [
+            profile_selector, country_selector, current_revenue, current_margin,
+            current_corp_tax, current_pers_tax, current_living, current_business,
+            revenue_multiplier, margin_improvement, success_probability,
+            time_horizon, discount_rate
+        ]
+        analysis_outputs = [
+            country_heatmap, main_dashboard, ai_insights_display,
+            kpi_cards, detailed_analysis, results_section
+        ]
+        
+        # Live what-if mode: quick KPI refresh on release, debounced full refresh
+        live_sliders = [revenue_multiplier, margin_improvement, success_probability,
+                        time_horizon, discount_rate]
+        deferred_events = []
+        for slider in live_sliders:
+            slider.release(
+                fn=run_live_preview,
+                inputs=[live_mode] + analysis_inputs,
+                outputs=[kpi_cards],
+                trigger_mode="always_last",
+                concurrency_id="live_preview",
+                show_progress="hidden"
+            )
+            deferred_events.append(slider.release(
+                fn=run_deferred_analysis,
+                inputs=[live_mode] + analysis_inputs,
+                outputs=analysis_outputs,
+                trigger_mode="always_last",
+                concurrency_limit=None,  # Every release must reach the gate to supersede older runs
+                show_progress="hidden"
+            ))
+        
+        live_mode.change(
+            fn=run_live_preview,
+            inputs=[live_mode] + analysis_inputs,
+            outputs=[kpi_cards],
+            show_progress="hidden"
+        )
+        
         compare_button.click(
             fn=run_comprehensive_analysis,
-            inputs=[
-                profile_selector, country_selector, current_revenue, current_margin,
-                current_corp_tax, current_pers_tax, current_living, current_business,
-                revenue_multiplier, margin_improvement, success_probability,
-                time_horizon, discount_rate
-            ],
-            outputs=[
-                country_heatmap, main_dashboard, ai_insights_display,
-                kpi_cards, detailed_analysis, results_section
-            ]
+            inputs=analysis_inputs,
+            outputs=analysis_outputs,
+            cancels=deferred_events
         )
         
         # Enhanced Footer
@@ -2859,6 +5013,453 @@ def create_premium_immigration_app():
     
     return app
 # =========================
+# BATCH SWEEP ENGINE
+# =========================
+
+# Inputs used for any dimension a sweep grid leaves out (the UI defaults)
+SWEEP_DEFAULT_INPUTS = {
+    "current_revenue": 65000, "current_margin": 25, "current_corp_tax": 25,
+    "current_pers_tax": 35, "current_living": 3500, "current_business": 800,
+    "revenue_multiplier": 1.5, "margin_improvement": 8, "success_probability": 75,
+    "time_horizon": 60, "discount_rate": 8
+}
+
+# Metrics written for every sweep row unless others are requested
+SWEEP_METRICS = ("roi", "npv", "total_return", "payback_months")
+
+# Monte Carlo summary columns added when a sweep simulates each row
+SWEEP_MONTE_CARLO_COLUMNS = ("mc_mean_roi", "mc_std_roi", "mc_var_95", "mc_probability_positive_roi")
+
+def _sweep_axes(grid: Dict[str, List[float]]) -> List[np.ndarray]:
+    """Value list for every calculator input, in ``ROI_INPUT_NAMES`` order"""
+    unknown = set(grid) - set(ROI_INPUT_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown sweep inputs: {sorted(unknown)}")
+    axes = [np.atleast_1d(np.asarray(grid.get(name, SWEEP_DEFAULT_INPUTS[name]), dtype=float))
+            for name in ROI_INPUT_NAMES]
+    for name, axis in zip(ROI_INPUT_NAMES, axes):
+        if axis.size == 0:
+            raise ValueError(f"Sweep input {name!r} has no values")
+    return axes
+
+def _sweep_job(job: Tuple) -> pd.DataFrame:
+    """Worker entry point: evaluate one chunk of a sweep grid.
+    Only the grid axes and a row range travel to the worker; the chunk's
+    input matrix is rebuilt there, so memory stays bounded by the chunk
+    size. Rows inside a chunk share a horizon and discount rate and are
+    evaluated in one ``_grid_metrics`` pass.
+    """
+    calculator, profile, country_key, country, axes, start, stop, metrics, monte_carlo, seed = job
+    cash_axes, time_horizon, discount_rate = axes[:9], axes[9][0], axes[10][0]
+    
+    flat_index = np.arange(start, stop)
+    positions = np.unravel_index(flat_index, [len(axis) for axis in cash_axes])
+    inputs = np.column_stack([axis[position] for axis, position in zip(cash_axes, positions)])
+    
+    # Same input validation as _normalize_inputs, column-wise
+    inputs[:, 0] = np.maximum(1000, inputs[:, 0])
+    inputs[:, 1] = np.clip(inputs[:, 1], 1, 95)
+    
+    frame = pd.DataFrame(inputs, columns=list(ROI_INPUT_NAMES[:9]))
+    frame.insert(0, "country", country_key)
+    frame.insert(0, "profile", profile.id)
+    frame["time_horizon"] = int(time_horizon)
+    frame["discount_rate"] = discount_rate
+    
+    evaluated = calculator._grid_metrics(profile, country, inputs, int(time_horizon),
+                                         discount_rate, metrics)
+    for metric in metrics:
+        frame[metric] = evaluated[metric]
+    
+    if monte_carlo:
+        kernel = calculator._cash_flow_kernel(country, int(time_horizon), discount_rate)
+        summaries = []
+        for row, index in zip(inputs, flat_index):
+            rng = make_rng(seed, "sweep", profile.id, country_key,
+                           f"{time_horizon:g}", f"{discount_rate:g}", str(index))
+            if calculator.adaptive_monte_carlo:
+                monthly_delta = calculator._adaptive_monte_carlo_deltas(profile, country, *row,
+                                                                        kernel=kernel, rng=rng)
+            else:
+                monthly_delta = calculator._monte_carlo_deltas(profile, country, *row, rng=rng)
+            summary = calculator._monte_carlo_summary(country, monthly_delta, kernel)
+            summaries.append((summary.get("mean_roi", 0), summary.get("std_roi", 0),
+                              summary.get("var_95", 0), summary.get("probability_positive_roi", 0)))
+        frame[list(SWEEP_MONTE_CARLO_COLUMNS)] = np.array(summaries, dtype=float)
+    
+    return frame
+
+def iter_sweep(grid: Dict[str, List[float]],
+               profiles: Optional[List[str]] = None,
+               countries: Optional[List[str]] = None,
+               chunk_size: int = 5000,
+               executor: Optional[AnalysisExecutor] = None,
+               calculator: Optional[AdvancedROICalculator] = None,
+               metrics: Tuple[str, ...] = SWEEP_METRICS,
+               monte_carlo: bool = False,
+               seed: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """Evaluate every profile x country x parameter-grid combination in chunks.
+    Args:
+        grid: Values to sweep per input name (from ``ROI_INPUT_NAMES``);
+            omitted inputs stay at ``SWEEP_DEFAULT_INPUTS``.
+        profiles: Profile ids to include; ``None`` sweeps all of them.
+        countries: Country ids to include; ``None`` sweeps all of them.
+        chunk_size: Maximum rows evaluated per job.
+        executor: Worker pool for the chunks; ``None`` runs them serially.
+        calculator: Calculator whose settings are used; defaults to a new one.
+        metrics: Metrics computed for every row (see ``_grid_metrics``).
+        monte_carlo: Also run a Monte Carlo simulation per row and add
+            ``SWEEP_MONTE_CARLO_COLUMNS``; much slower than the
+            closed-form metrics.
+        seed: Root seed for the per-row Monte Carlo streams.
+    Returns:
+        An iterator of result frames, one per chunk in completion order,
+        so callers can stream them to disk with bounded memory.
+    """
+    profiles = list(ENHANCED_PROFILES) if profiles is None else profiles
+    countries = list(ENHANCED_COUNTRIES) if countries is None else countries
+    for key, table in ((profiles, ENHANCED_PROFILES), (countries, ENHANCED_COUNTRIES)):
+        missing = [k for k in key if k not in table]
+        if missing:
+            raise ValueError(f"Unknown ids in sweep: {missing}")
+    
+    calculator = calculator if calculator is not None else AdvancedROICalculator()
+    executor = executor if executor is not None else AnalysisExecutor(kind="serial")
+    axes = _sweep_axes(grid)
+    rows_per_group = int(np.prod([len(axis) for axis in axes[:9]]))
+    
+    def jobs():
+        # One group per (profile, country, horizon, discount rate), split into chunks
+        for profile_id in profiles:
+            for country_key in countries:
+                for time_horizon in axes[9]:
+                    for discount_rate in axes[10]:
+                        group_axes = axes[:9] + [np.array([time_horizon]), np.array([discount_rate])]
+                        for start in range(0, rows_per_group, chunk_size):
+                            yield (calculator, ENHANCED_PROFILES[profile_id], country_key,
+                                   ENHANCED_COUNTRIES[country_key], group_axes, start,
+                                   min(start + chunk_size, rows_per_group), tuple(metrics),
+                                   monte_carlo, seed)
+    
+    # Keep only a couple of chunks per worker in flight, refilling as each lands
+    yield from executor.imap_bounded(_sweep_job, jobs())
+
+def run_sweep(path: str, grid: Dict[str, List[float]], file_format: Optional[str] = None,
+              **options) -> int:
+    """Stream a batch sweep to a CSV or Parquet file.
+    Args:
+        path: Output file path.
+        grid: Values to sweep per input name, as for ``iter_sweep``.
+        file_format: ``"csv"`` or ``"parquet"``; inferred from the file
+            extension when ``None``.
+        **options: Passed on to ``iter_sweep``.
+    Returns:
+        Number of rows written.
+    Raises:
+        ImportError: Parquet output was requested but pyarrow is missing.
+    """
+    file_format = file_format or ("parquet" if path.endswith((".parquet", ".pq")) else "csv")
+    if file_format not in ("csv", "parquet"):
+        raise ValueError(f"Unknown sweep output format: {file_format}")
+    
+    if file_format == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export needs pyarrow: pip install pyarrow")
+    
+    rows = 0
+    writer = None
+    try:
+        for frame in iter_sweep(grid, **options):
+            if file_format == "csv":
+                frame.to_csv(path, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+            else:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            rows += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+# =========================
+# COMMAND LINE INTERFACE
+# =========================
+
+def _float_list(text: str) -> List[float]:
+    """Parse a comma-separated list of numbers"""
+    return [float(value) for value in text.split(",") if value.strip()]
+
+def _id_list(text: str) -> List[str]:
+    """Parse a comma-separated list of identifiers"""
+    return [value.strip() for value in text.split(",") if value.strip()]
+
+def _point_budget(text: str) -> Optional[int]:
+    """Parse a chart point budget; ``0`` means no limit"""
+    budget = int(text)
+    if budget == 0:
+        return None
+    if budget < 4:
+        raise argparse.ArgumentTypeError("must be 0 or at least 4")
+    return budget
+
+def _weight_list(text: str) -> Dict[str, float]:
+    """Parse ``COUNTRY=WEIGHT`` pairs separated by commas"""
+    weights = {}
+    for pair in _id_list(text):
+        key, _, weight = pair.partition("=")
+        weights[key.strip()] = float(weight or 1)
+    return weights
+
+IMPORT_TIME_BUDGET = 1.0  # seconds for a cold ``import app``
+UI_MODULES = ("gradio", "plotly")
+
+def measure_import_time(repeat: int = 3) -> Tuple[float, List[str]]:
+    """Time importing this module in fresh interpreters.
+    Args:
+        repeat: Number of cold imports; the fastest is reported.
+    Returns:
+        Tuple of the best import time in seconds and the UI modules (Gradio,
+        Plotly) that the import pulled in, which should be none.
+    """
+    module_dir, module_file = os.path.split(os.path.abspath(__file__))
+    module_name = os.path.splitext(module_file)[0]
+    probe = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module_name}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"loaded = [m for m in {UI_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps([elapsed, loaded]))"
+    )
+    timings = []
+    loaded = []
+    for _ in range(max(1, repeat)):
+        output = subprocess.run([sys.executable, "-c", probe], cwd=module_dir or None,
+                                capture_output=True, text=True, check=True).stdout
+        elapsed, loaded = json.loads(output.strip().splitlines()[-1])
+        timings.append(elapsed)
+    return min(timings), loaded
+
+def build_cli_parser() -> argparse.ArgumentParser:
+    """Argument parser for the ``serve`` (default) command and the headless tools"""
+    parser = argparse.ArgumentParser(description="VisaTier 5.0 immigration ROI calculator")
+    commands = parser.add_subparsers(dest="command")
+    
+    serve = commands.add_parser("serve", help="Launch the web application (default)")
+    serve.add_argument("--fast-charts", action="store_true",
+                       help="Send charts as raw Plotly JSON, skipping object validation")
+    serve.add_argument("--max-chart-points", type=_point_budget, default=CHART_POINT_BUDGET,
+                       help="Point budget per line trace; 0 draws every point")
+    
+    simulate = commands.add_parser("simulate", help="Run the comprehensive analysis headlessly")
+    simulate.add_argument("--profile", default="tech_startup", choices=list(ENHANCED_PROFILES))
+    simulate.add_argument("--countries", type=_id_list, default=["UAE", "Singapore", "Portugal", "Ireland"],
+                          help="Comma-separated country ids")
+    for name in ROI_INPUT_NAMES:
+        simulate.add_argument(f"--{name.replace('_', '-')}", dest=name, type=float,
+                              default=SWEEP_DEFAULT_INPUTS[name])
+    simulate.add_argument("--seed", type=int, help="Root seed for reproducible simulations")
+    simulate.add_argument("--iterations", type=int, help="Monte Carlo iterations")
+    simulate.add_argument("--sampling", choices=SAMPLING_STRATEGIES, help="Monte Carlo sampling strategy")
+    simulate.add_argument("--adaptive", action="store_true", help="Stop Monte Carlo once it converges")
+    simulate.add_argument("--weights", type=_weight_list,
+                          help="Also simulate a portfolio, e.g. UAE=0.6,Portugal=0.4")
+    simulate.add_argument("--json", action="store_true", help="Print full results as JSON")
+    
+    sweep = commands.add_parser("sweep", help="Batch-evaluate a profile x country x parameter grid")
+    sweep.add_argument("--output", required=True, help="Output .csv or .parquet file")
+    sweep.add_argument("--format", choices=("csv", "parquet"), help="Output format (default: from extension)")
+    sweep.add_argument("--profiles", type=_id_list, help="Comma-separated profile ids (default: all)")
+    sweep.add_argument("--countries", type=_id_list, help="Comma-separated country ids (default: all)")
+    for name in ROI_INPUT_NAMES:
+        sweep.add_argument(f"--{name.replace('_', '-')}", dest=name, type=_float_list,
+                           help=f"Comma-separated {name} values (default: {SWEEP_DEFAULT_INPUTS[name]})")
+    sweep.add_argument("--metrics", type=_id_list, default=list(SWEEP_METRICS),
+                       help="Comma-separated metrics per row")
+    sweep.add_argument("--monte-carlo", action="store_true", help="Add per-row Monte Carlo columns")
+    sweep.add_argument("--adaptive", action="store_true", help="Stop each row's Monte Carlo once it converges")
+    sweep.add_argument("--seed", type=int, help="Root seed for Monte Carlo streams")
+    sweep.add_argument("--chunk-size", type=int, default=5000, help="Rows per job")
+    sweep.add_argument("--executor", choices=("process", "thread", "serial"), default="process")
+    sweep.add_argument("--workers", type=int, help="Worker count (default: CPU count)")
+    check_import = commands.add_parser("check-import",
+                                       help="Fail if importing the module is slow or loads the UI stack")
+    check_import.add_argument("--budget", type=float, default=IMPORT_TIME_BUDGET,
+                              help="Maximum cold import time in seconds")
+    check_import.add_argument("--repeat", type=int, default=3, help="Cold imports to time")
+    
+    bench_figures = commands.add_parser("bench-figures",
+                                        help="Compare validated and raw JSON chart build time and size")
+    bench_figures.add_argument("--profile", default="tech_startup", choices=list(ENHANCED_PROFILES))
+    bench_figures.add_argument("--countries", type=_id_list, default=["UAE", "Singapore", "Portugal", "Ireland"],
+                               help="Comma-separated country ids; the first one gets the dashboard")
+    bench_figures.add_argument("--repeat", type=int, default=20, help="Timed builds per chart")
+    bench_figures.add_argument("--seed", type=int, default=0, help="Root seed of the analysis")
+    
+    return parser
+
+def run_sweep_command(args: argparse.Namespace) -> int:
+    """Execute the ``sweep`` command and report progress on stdout"""
+    grid = {name: getattr(args, name) for name in ROI_INPUT_NAMES if getattr(args, name)}
+    executor = AnalysisExecutor(kind=args.executor, max_workers=args.workers)
+    calculator = AdvancedROICalculator()
+    calculator.adaptive_monte_carlo = args.adaptive
+    started = time.perf_counter()
+    try:
+        rows = run_sweep(
+            args.output, grid, file_format=args.format,
+            profiles=args.profiles, countries=args.countries,
+            chunk_size=args.chunk_size, executor=executor, calculator=calculator,
+            metrics=tuple(args.metrics), monte_carlo=args.monte_carlo, seed=args.seed
+        )
+    except ImportError as e:
+        print(e)
+        return 2
+    finally:
+        executor.shutdown()
+    print(f"Wrote {rows} rows to {args.output} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+def run_simulate_command(args: argparse.Namespace) -> int:
+    """Execute the ``simulate`` command and print a summary table or JSON"""
+    missing = [key for key in args.countries if key not in ENHANCED_COUNTRIES]
+    if missing:
+        print(f"Unknown countries: {', '.join(missing)}")
+        return 2
+    
+    calculator = AdvancedROICalculator(seed=args.seed)
+    if args.iterations:
+        calculator.monte_carlo_iterations = args.iterations
+    if args.sampling:
+        calculator.sampling = args.sampling
+    calculator.adaptive_monte_carlo = args.adaptive
+    
+    profile = ENHANCED_PROFILES[args.profile]
+    countries = {key: ENHANCED_COUNTRIES[key] for key in args.countries}
+    inputs = [getattr(args, name) for name in ROI_INPUT_NAMES]
+    results = calculator.calculate_many(profile, countries, *inputs)
+    portfolio = (calculator.calculate_portfolio(profile, countries, args.weights, *inputs)
+                 if args.weights else None)
+    
+    if args.json:
+        output = {"profile": profile.id, "results": results}
+        if portfolio is not None:
+            output["portfolio"] = portfolio
+        print(json.dumps(output, indent=2, default=lambda value: value.tolist()
+                         if isinstance(value, np.ndarray) else float(value)))
+        return 0
+    
+    rows = [{
+        "country": countries[key].name,
+        "roi_%": result["roi"],
+        "npv": result["npv"],
+        "payback_months": result["payback_months"],
+        "mc_mean_roi_%": result.get("monte_carlo", {}).get("mean_roi", 0),
+        "var_95_%": result.get("monte_carlo", {}).get("var_95", 0),
+        "p_positive": result.get("monte_carlo", {}).get("probability_positive_roi", 0),
+        "recommendation": result.get("recommendation", "").split(" - ")[0]
+    } for key, result in results.items()]
+    print(f"Profile: {profile.name}")
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda value: f"{value:,.1f}"))
+    if portfolio:
+        print(f"\nPortfolio {portfolio['weights']}: mean ROI {portfolio['mean_roi']:,.1f}%, "
+              f"VaR 95 {portfolio['var_95']:,.1f}%, "
+              f"diversification benefit {portfolio['diversification_benefit']['var_95']:,.1f} pts")
+    return 0
+
+def run_check_import_command(args: argparse.Namespace) -> int:
+    """Execute the ``check-import`` command; non-zero exit when over budget"""
+    elapsed, loaded = measure_import_time(args.repeat)
+    print(f"Cold import: {elapsed:.3f}s (budget {args.budget:.3f}s)")
+    if loaded:
+        print(f"UI modules loaded at import: {', '.join(loaded)}")
+    return 0 if elapsed <= args.budget and not loaded else 1
+
+def benchmark_figures(profile_id: str, country_keys: List[str], repeat: int = 20,
+                      seed: Optional[int] = 0) -> pd.DataFrame:
+    """Time the validated and ``fast`` chart paths, including serialization.
+    Args:
+        profile_id: Profile analysed.
+        country_keys: Countries of the heatmap; the first one also gets the
+            dashboard.
+        repeat: Timed builds per chart and path, after one warm-up build.
+        seed: Root seed of the underlying analysis.
+    Returns:
+        DataFrame with one row per chart and path: mean build plus
+        ``to_json`` time in milliseconds and the JSON payload size.
+    """
+    profile = ENHANCED_PROFILES[profile_id]
+    country = ENHANCED_COUNTRIES[country_keys[0]]
+    result = AdvancedROICalculator(seed=seed).calculate_comprehensive_roi(
+        profile, country, *(SWEEP_DEFAULT_INPUTS[name] for name in ROI_INPUT_NAMES)
+    )
+    charts = {
+        "dashboard": lambda fast: AdvancedChartGenerator.create_comprehensive_dashboard(
+            result, country.name, profile.name, fast=fast),
+        "heatmap": lambda fast: AdvancedChartGenerator.create_country_heatmap(
+            country_keys, profile_id, fast=fast)
+    }
+    
+    rows = []
+    for chart, build in charts.items():
+        for fast in (False, True):
+            payload = build(fast).to_json()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                build(fast).to_json()
+            rows.append({
+                "chart": chart,
+                "path": "fast" if fast else "validated",
+                "ms": (time.perf_counter() - start) / repeat * 1000,
+                "bytes": len(payload.encode())
+            })
+    return pd.DataFrame(rows)
+
+def run_bench_figures_command(args: argparse.Namespace) -> int:
+    """Execute the ``bench-figures`` command and print the comparison"""
+    missing = [key for key in args.countries if key not in ENHANCED_COUNTRIES]
+    if missing:
+        print(f"Unknown countries: {', '.join(missing)}")
+        return 2
+    
+    table = benchmark_figures(args.profile, args.countries, args.repeat, args.seed)
+    print(table.to_string(index=False, float_format=lambda value: f"{value:,.2f}"))
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point; without a command the web app is served"""
+    args = build_cli_parser().parse_args(argv)
+    if args.command == "sweep":
+        return run_sweep_command(args)
+    if args.command == "simulate":
+        return run_simulate_command(args)
+    if args.command == "check-import":
+        return run_check_import_command(args)
+    if args.command == "bench-figures":
+        return run_bench_figures_command(args)
+    
+    # Create and launch the enhanced application
+    app = create_premium_immigration_app(
+        fast_charts=getattr(args, "fast_charts", False),
+        max_chart_points=getattr(args, "max_chart_points", CHART_POINT_BUDGET)
+    )
+    
+    # Development server
+    app.launch(
+        server_name="0.0.0.0",
+        server_port=7860,
+        share=False,
+        debug=True,
+        show_error=True
+    )
+    return 0
+
+# =========================
 # ADDITIONAL UTILITY FUNCTIONS
 # =========================
 def generate_pdf_report(result: Dict, profile: UserProfile, country: CountryData) -> str:
@@ -2875,14 +5476,4 @@ def schedule_consultation(email: str, profile: str, country: str, roi: float) ->
 # MAIN EXECUTION
 # =========================
 if __name__ == "__main__":
-    # Create and launch the enhanced application
-    app = create_premium_immigration_app()
-    
-    # Development server
-    app.launch(
-        server_name="0.0.0.0",
-        server_port=7860,
-        share=False,
-        debug=True,
-        show_error=True
-    )
+    raise SystemExit(main())
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from app import (
+    ENHANCED_COUNTRIES, ENHANCED_PROFILES, ROI_INPUT_NAMES, SWEEP_DEFAULT_INPUTS,
+    AdvancedROICalculator, ResultCache, iter_sweep
+)
+
+
+def _calculator():
+    calculator = AdvancedROICalculator(result_cache=ResultCache(maxsize=0), seed=11)
+    calculator.adaptive_monte_carlo = True
+    return calculator
+
+
+@pytest.mark.parametrize("profile_id", sorted(ENHANCED_PROFILES))
+def test_typical_inputs_meet_tail_tolerance(profile_id):
+    calculator = _calculator()
+    profile = ENHANCED_PROFILES[profile_id]
+    inputs = dict(SWEEP_DEFAULT_INPUTS, current_revenue=profile.typical_revenue)
+    for country in ENHANCED_COUNTRIES.values():
+        monte_carlo = calculator.calculate_comprehensive_roi(
+            profile, country, *(inputs[name] for name in ROI_INPUT_NAMES)
+        )["monte_carlo"]
+        assert monte_carlo["converged"]
+        assert calculator.monte_carlo_iterations <= monte_carlo["iterations"] < calculator.monte_carlo_max_iterations
+        for key in ("roi_5", "roi_95"):
+            half_width = 1.96 * monte_carlo["standard_errors"][key]
+            assert half_width <= calculator.quantile_tolerance * monte_carlo["std_roi"]
+
+
+def test_tails_need_at_least_the_fixed_iteration_count():
+    calculator = _calculator()
+    rois = np.random.default_rng(0).normal(1000.0, 10.0, calculator.monte_carlo_iterations - 1)
+    assert not calculator._monte_carlo_converged(rois, calculator._monte_carlo_errors(rois))
+
+
+def test_mean_roi_near_zero_converges_on_absolute_tolerance():
+    calculator = _calculator()
+    rois = np.random.default_rng(0).normal(0.0, 300.0, 4000)
+    errors = calculator._monte_carlo_errors(rois)
+    assert calculator._monte_carlo_converged(rois, errors)
+    
+    calculator.absolute_roi_tolerance = 0.0
+    assert not calculator._monte_carlo_converged(rois, errors)
+
+
+def test_sweep_honours_adaptive_flag():
+    calculator = _calculator()
+    # Tight enough that adaptive runs draw past the fixed iteration count
+    calculator.quantile_tolerance = 0.05
+    frames = list(iter_sweep({"revenue_multiplier": [1.2, 1.5]}, profiles=["tech_startup"],
+                             countries=["Portugal"], calculator=calculator,
+                             monte_carlo=True, seed=3))
+    fixed = list(iter_sweep({"revenue_multiplier": [1.2, 1.5]}, profiles=["tech_startup"],
+                            countries=["Portugal"], monte_carlo=True, seed=3))
+    assert not frames[0]["mc_std_roi"].equals(fixed[0]["mc_std_roi"])
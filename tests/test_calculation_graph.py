@@ -0,0 +1,60 @@
+import os
+from collections import Counter
+
+import pytest
+
+from app import (
+    ENHANCED_COUNTRIES, ENHANCED_PROFILES, ROI_INPUT_NAMES, SWEEP_DEFAULT_INPUTS,
+    AdvancedROICalculator, AnalysisExecutor, ResultCache, _comprehensive_roi_job
+)
+
+PROFILE = ENHANCED_PROFILES["tech_startup"]
+COUNTRY = ENHANCED_COUNTRIES["Portugal"]
+
+
+def _inputs(**overrides):
+    return tuple(float(overrides.get(name, SWEEP_DEFAULT_INPUTS[name])) for name in ROI_INPUT_NAMES)
+
+
+def _job_with_evaluations(job):
+    """Runs in the worker: the job plus its graph's evaluation counts"""
+    calculator, profile, country, _, _ = job
+    _, error = _comprehensive_roi_job(job)
+    return os.getpid(), error, dict(calculator._calculation_graph(profile, country).evaluations)
+
+
+def test_process_workers_reuse_graph_nodes_across_jobs():
+    calculator = AdvancedROICalculator(result_cache=ResultCache(maxsize=0), seed=7)
+    calculator.monte_carlo_iterations = 200
+    executor = AnalysisExecutor(kind="process", max_workers=2)
+    jobs = [(calculator, PROFILE, COUNTRY, _inputs(discount_rate=8 + i % 2), 7) for i in range(6)]
+    try:
+        outcomes = executor.map(_job_with_evaluations, jobs)
+    finally:
+        executor.shutdown()
+    if executor.kind != "process":
+        pytest.skip("process pool unavailable here")
+    
+    jobs_per_worker = Counter(pid for pid, _, _ in outcomes)
+    assert all(error is None for _, error, _ in outcomes)
+    assert max(jobs_per_worker.values()) >= 2
+    # A worker's graph outlives its first job: later jobs only change the
+    # discount rate, so they re-summarize the draws without redrawing them
+    assert max(evaluations["monte_carlo"] for _, _, evaluations in outcomes) >= 2
+    assert all(evaluations["monte_carlo_draws"] == 1 for _, _, evaluations in outcomes)
+
+
+def test_monte_carlo_failure_only_zeroes_monte_carlo(monkeypatch):
+    calculator = AdvancedROICalculator(result_cache=ResultCache(maxsize=0), seed=7)
+    healthy = calculator.calculate_comprehensive_roi(PROFILE, COUNTRY, *_inputs())
+    
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+    
+    failing = AdvancedROICalculator(result_cache=ResultCache(maxsize=0), seed=7)
+    monkeypatch.setattr(failing, "_monte_carlo_deltas", fail)
+    result = failing.calculate_comprehensive_roi(PROFILE, COUNTRY, *_inputs())
+    
+    assert result["monte_carlo"] == {"mean_roi": 0, "std_roi": 0, "probability_positive_roi": 0}
+    assert result["roi"] == healthy["roi"]
+    assert result["scenarios"] == healthy["scenarios"]
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from app import (
+    ENHANCED_COUNTRIES, ENHANCED_PROFILES, ROI_INPUT_NAMES, SWEEP_DEFAULT_INPUTS,
+    AdvancedChartGenerator, AdvancedROICalculator, build_cli_parser, downsample_line
+)
+
+
+@pytest.mark.parametrize("budget", [4, 5, 10, 120])
+def test_downsample_line_never_exceeds_budget(budget):
+    y = np.sin(np.arange(2000) * 0.9) * 100
+    x = np.arange(len(y))
+    
+    kept_x, kept_y = downsample_line(x, y, budget)
+    
+    assert len(kept_x) == len(kept_y) <= budget
+    assert kept_x[0] == 0 and kept_x[-1] == len(y) - 1
+
+
+def test_downsample_line_keeps_payback_crossing():
+    y = np.concatenate([np.linspace(-5000, -1, 137), np.linspace(1, 9000, 463)])
+    y[300:] += np.sin(np.arange(300)) * 20000
+    
+    kept_x, _ = downsample_line(np.arange(len(y)), y, 10)
+    
+    assert len(kept_x) <= 10
+    assert {136, 137} <= set(kept_x.tolist())
+
+
+def test_downsample_line_rejects_tiny_budget():
+    with pytest.raises(ValueError):
+        downsample_line(np.arange(10), np.arange(10), 3)
+
+
+def test_serve_max_chart_points_option():
+    parser = build_cli_parser()
+    
+    assert parser.parse_args(["serve", "--max-chart-points", "60"]).max_chart_points == 60
+    assert parser.parse_args(["serve", "--max-chart-points", "0"]).max_chart_points is None
+    with pytest.raises(SystemExit):
+        parser.parse_args(["serve", "--max-chart-points", "2"])
+
+
+def test_fast_dashboard_traces_match_validated_figure():
+    calculator = AdvancedROICalculator(seed=3)
+    result = calculator.calculate_comprehensive_roi(
+        ENHANCED_PROFILES["tech_startup"], ENHANCED_COUNTRIES["Portugal"],
+        *[SWEEP_DEFAULT_INPUTS[name] for name in ROI_INPUT_NAMES]
+    )
+    
+    fast = AdvancedChartGenerator.create_comprehensive_dashboard(result, "Portugal", "Tech", fast=True)
+    validated = AdvancedChartGenerator.create_comprehensive_dashboard(result, "Portugal", "Tech")
+    fast_data = fast.to_dict()["data"]
+    validated_data = validated.to_dict()["data"]
+    
+    assert len(fast_data) == len(validated_data)
+    for fast_trace, validated_trace in zip(fast_data, validated_data):
+        # plotly.js does not expand plotly.py's underscore shorthand (marker_color, ...)
+        assert set(fast_trace) <= set(validated_trace)
+        if "marker" in validated_trace:
+            assert fast_trace["marker"]["color"] == validated_trace["marker"]["color"]
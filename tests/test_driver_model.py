@@ -0,0 +1,36 @@
+import numpy as np
+
+from app import ENHANCED_COUNTRIES, AdvancedROICalculator, DriverModel
+
+DRAWS = 400_000
+
+
+def _legacy_drivers(rng):
+    """The hand-coded draws that DriverModel replaced"""
+    market_shock = rng.normal(0, 0.2, DRAWS)
+    revenue = rng.normal(1.0, 0.18, DRAWS) + market_shock * 0.3
+    margin = rng.normal(1.0, 0.12, DRAWS) - revenue * 0.1
+    success = rng.beta(8, 2, DRAWS) * 1.2
+    cost_inflation = np.maximum(0.8, rng.normal(1.0, 0.15, DRAWS))
+    return revenue, margin, success, cost_inflation
+
+
+def test_default_model_reproduces_legacy_moments():
+    # Portugal has non-zero risk factors, which must not widen the default model
+    model = AdvancedROICalculator()._driver_model(ENHANCED_COUNTRIES["Portugal"])
+    drivers = model.sample(np.random.default_rng(1).standard_normal((DRAWS, 4)))
+    legacy = _legacy_drivers(np.random.default_rng(2))
+    
+    for new, old in zip(drivers, legacy):
+        assert abs(new.mean() - old.mean()) < 0.002
+        assert abs(new.std() / old.std() - 1) < 0.01
+    assert abs(np.corrcoef(drivers[0], drivers[1])[0, 1] - np.corrcoef(legacy[0], legacy[1])[0, 1]) < 0.01
+
+
+def test_risk_weight_widens_volatilities_when_enabled():
+    risk_factors = ENHANCED_COUNTRIES["Portugal"].risk_factors
+    assert DriverModel().for_risk(risk_factors) == DriverModel()
+    
+    widened = DriverModel(risk_volatility_weight=1.0).for_risk(risk_factors)
+    assert widened.revenue_volatility > DriverModel().revenue_volatility
+    assert widened.margin_volatility > DriverModel().margin_volatility
@@ -0,0 +1,8 @@
+from app import IMPORT_TIME_BUDGET, measure_import_time
+
+
+def test_import_stays_within_budget_without_ui_modules():
+    elapsed, loaded = measure_import_time(repeat=1)
+    
+    assert loaded == []
+    assert elapsed <= IMPORT_TIME_BUDGET
@@ -0,0 +1,21 @@
+from app import SessionDebounceGates
+
+
+def test_sessions_have_independent_gates():
+    gates = SessionDebounceGates(delay=0)
+    first, second = gates.gate("first"), gates.gate("second")
+    assert gates.gate("first") is first
+    
+    token = first.begin()
+    second.begin()
+    assert first.is_current(token)
+
+
+def test_least_recently_used_sessions_are_forgotten():
+    gates = SessionDebounceGates(delay=0, max_sessions=2)
+    first = gates.gate("first")
+    second = gates.gate("second")
+    gates.gate("first")
+    gates.gate("third")
+    assert gates.gate("first") is first
+    assert gates.gate("second") is not second
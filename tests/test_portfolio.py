@@ -0,0 +1,31 @@
+import pytest
+
+from app import (
+    ENHANCED_COUNTRIES, ENHANCED_PROFILES, ROI_INPUT_NAMES, SWEEP_DEFAULT_INPUTS,
+    AdvancedROICalculator
+)
+
+INPUTS = [SWEEP_DEFAULT_INPUTS[name] for name in ROI_INPUT_NAMES]
+
+
+@pytest.mark.parametrize("keys", [("UAE", "Portugal"), ("UAE", "Portugal", "Malta", "Ireland")])
+def test_multi_country_sobol_portfolio_falls_back_to_lhs(keys, capsys):
+    calculator = AdvancedROICalculator(seed=5)
+    calculator.sampling = "sobol"
+    countries = {key: ENHANCED_COUNTRIES[key] for key in keys}
+    
+    portfolio = calculator.calculate_portfolio(ENHANCED_PROFILES["tech_startup"], countries,
+                                               {key: 1.0 for key in keys}, *INPUTS)
+    
+    assert portfolio["sampling"] == "lhs"
+    assert set(portfolio["countries"]) == set(keys)
+    assert portfolio["iterations"] == calculator.monte_carlo_iterations
+    assert "Latin hypercube" in capsys.readouterr().out
+
+
+def test_single_country_sobol_portfolio_keeps_sobol():
+    calculator = AdvancedROICalculator(seed=5)
+    calculator.sampling = "sobol"
+    portfolio = calculator.calculate_portfolio(ENHANCED_PROFILES["tech_startup"],
+                                               {"UAE": ENHANCED_COUNTRIES["UAE"]}, {"UAE": 1.0}, *INPUTS)
+    assert portfolio["sampling"] == "sobol"
@@ -0,0 +1,66 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app import AnalysisExecutor, iter_sweep, main
+
+
+def test_imap_bounded_refills_as_jobs_complete():
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0, "started": []}
+    
+    def job(delay):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            state["started"].append(delay)
+        time.sleep(delay)
+        with lock:
+            state["running"] -= 1
+        return delay
+    
+    executor = AnalysisExecutor(kind="thread", max_workers=2)
+    try:
+        # One slow job must not hold back the fast ones queued behind it
+        delays = [0.5] + [0.01] * 8
+        results = list(executor.imap_bounded(job, iter(delays), max_in_flight=2))
+    finally:
+        executor.shutdown()
+    
+    assert sorted(results) == sorted(delays)
+    assert results[-1] == 0.5
+    assert state["peak"] <= 2
+
+
+def test_iter_sweep_streams_every_row_through_pool():
+    grid = {"current_revenue": [50000, 80000, 120000], "revenue_multiplier": [1.2, 1.5]}
+    executor = AnalysisExecutor(kind="thread", max_workers=2)
+    try:
+        frames = list(iter_sweep(grid, profiles=["tech_startup"], countries=["UAE", "Portugal"],
+                                 chunk_size=2, executor=executor))
+    finally:
+        executor.shutdown()
+    serial = list(iter_sweep(grid, profiles=["tech_startup"], countries=["UAE", "Portugal"],
+                             chunk_size=2))
+    
+    assert len(frames) == len(serial) == 6
+    key = ["country", "current_revenue", "revenue_multiplier"]
+    pooled = sorted(map(tuple, np.concatenate([f[key + ["roi"]].values for f in frames])))
+    expected = sorted(map(tuple, np.concatenate([f[key + ["roi"]].values for f in serial])))
+    assert pooled == expected
+
+
+def test_sweep_command_reports_missing_pyarrow(tmp_path, capsys):
+    try:
+        import pyarrow  # noqa: F401
+        pytest.skip("pyarrow is installed")
+    except ImportError:
+        pass
+    
+    code = main(["sweep", "--output", str(tmp_path / "sweep.parquet"),
+                 "--profiles", "tech_startup", "--countries", "UAE"])
+    
+    assert code == 2
+    assert "pip install pyarrow" in capsys.readouterr().out